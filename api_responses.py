@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+HTTP caching and compression for JSON API responses
+Adds strong content-hash ETags, answers If-None-Match with 304, negotiates
+gzip (or brotli, when installed) from Accept-Encoding and sets Cache-Control.
+"""
+
+import gzip
+import hashlib
+from typing import Optional
+
+from flask import Request, Response
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Bodies smaller than this are sent as-is; compression would not pay off
+MIN_COMPRESS_SIZE = 1024
+
+
+def _negotiate_encoding(request: Request) -> Optional[str]:
+    offered = ["br", "gzip"] if brotli is not None else ["gzip"]
+    encoding = request.accept_encodings.best_match(offered)
+    return encoding if encoding and request.accept_encodings[encoding] > 0 else None
+
+
+def _compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=5)
+    return gzip.compress(body, compresslevel=6)
+
+
+def finalize_json_response(response: Response, request: Request, cache_control: str) -> Response:
+    """Apply ETag / 304 handling, Cache-Control and compression to a JSON response"""
+    if (response.status_code != 200 or response.mimetype != "application/json"
+            or response.is_streamed or response.direct_passthrough):
+        return response
+
+    body = response.get_data()
+    base_etag = hashlib.sha256(body).hexdigest()[:32]
+    encoding = _negotiate_encoding(request) if len(body) >= MIN_COMPRESS_SIZE else None
+    # Each encoding is a different representation, so it gets its own strong ETag
+    etag = f"{base_etag}-{encoding}" if encoding else base_etag
+
+    response.headers["Cache-Control"] = cache_control
+    response.vary.add("Accept-Encoding")
+
+    if request.if_none_match.contains(etag) or request.if_none_match.contains(base_etag):
+        not_modified = Response(status=304)
+        not_modified.set_etag(etag)
+        not_modified.headers["Cache-Control"] = cache_control
+        not_modified.vary.add("Accept-Encoding")
+        return not_modified
+
+    response.set_etag(etag)
+    if encoding:
+        response.set_data(_compress(body, encoding))
+        response.headers["Content-Encoding"] = encoding
+    return response
@@ -3,157 +3,214 @@
 Flask Backend for AI Alignment Forum News Scraper
 """
 
-from flask import Flask, request, jsonify, render_template_string
+from flask import Flask, Response, g, request, jsonify, stream_with_context
 from flask_cors import CORS
-import requests
-from bs4 import BeautifulSoup
 import json
-import re
+from contextvars import ContextVar
 from datetime import datetime
+import asyncio
+import os
+import threading
 import time
+from scrape_cache import ScrapeCache
+from scheduler import ScrapeScheduler
+from shared_state import LeaderLock, SnapshotStore
+from article_store import ArticleStore
+from api_responses import finalize_json_response
+from page_cache import PageCache
+from universal_ai_scraper import UniversalAIScraper
+from rate_limit import get_rate_limiter
+from resilience import Deadline
+from metrics import REGISTRY, REQUEST_SECONDS
+from profiling import ScrapeProfiler
 
 app = Flask(__name__)
 CORS(app)  # Enable CORS for all routes
 
-class AlignmentForumScraper:
-    def __init__(self):
-        self.base_url = "https://www.alignmentforum.org/"
-        self.headers = {
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
+universal_scraper = UniversalAIScraper(use_feeds=os.environ.get("SCRAPE_USE_FEEDS", "1") == "1")
+
+# /api/scrape serves this source's result (from its scheduler job or a cached scrape)
+AF_SOURCE = "ai_alignment_forum"
+
+# Shared response cache for the scraping endpoints
+cache = ScrapeCache.from_env()
+
+# Every scraped article is persisted here, deduplicated by URL
+store = ArticleStore()
+if universal_scraper.incremental:
+    universal_scraper.seed_seen(store)
+
+
+def persist(source_key, result):
+    """Upsert a successful scrape result into the article store and pass it through"""
+    if result.get("success") and not result.get("not_modified"):
+        # Incremental results only need their new articles stored
+        articles = result["new_articles"] if "new_articles" in result else result.get("articles") or result.get("posts")
+        store.upsert(source_key, articles or [])
+    return result
+
+
+def persist_all(news_data):
+    for source_key, result in news_data["sources"].items():
+        persist(source_key, result)
+    return news_data
+
+
+def scrape_all_and_persist():
+    return persist_all(universal_scraper.scrape_all_sources())
+
+
+async def scrape_all_and_persist_async(session=None):
+    news_data = await universal_scraper.scrape_all_sources_async(session)
+    return await asyncio.to_thread(persist_all, news_data)
+
+
+# Background pre-scraping; endpoints answer from its snapshots once it is running.
+# Under a multi-process server only the worker holding the leader lock scrapes and
+# the others read its snapshots from the shared store while the leader holds its lock.
+SCHEDULING = os.environ.get("SCRAPE_SCHEDULER", "1") == "1"
+snapshots = SnapshotStore()
+leader = LeaderLock()
+scheduler = ScrapeScheduler(shared=snapshots if SCHEDULING else None, leader=leader)
+for source_key, source in universal_scraper.sources.items():
+    scheduler.add_job(source_key, lambda key=source_key: persist(key, universal_scraper.scrape_source(key)),
+                      interval=source["refresh_interval"])
+
+
+def start_background_scraping(retry_interval=30):
+    """Run the scheduler in this process if it wins the leader lock, else keep trying"""
+    if not SCHEDULING:
+        return
+    
+    def campaign():
+        while not leader.acquire():
+            time.sleep(retry_interval)
+        scheduler.start()
     
-    def scrape_news(self):
-        """Scrape news posts from the main page"""
-        try:
-            print(f"Scraping {self.base_url}...")
-            response = requests.get(self.base_url, headers=self.headers, timeout=15)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Find the posts container
-            posts_container = soup.find('div', class_='PostsList2-postsBoxShadow')
-            
-            if not posts_container:
-                print("Posts container not found. Looking for alternative selectors...")
-                # Try alternative selectors
-                posts_container = soup.find('div', class_=re.compile(r'PostsList.*'))
-                if not posts_container:
-                    return {"error": "Posts container not found"}
-            
-            # Find all post spans
-            post_spans = posts_container.find_all('span', class_=re.compile(r'post_.*'))
-            
-            if not post_spans:
-                print("Post spans not found. Looking for alternative selectors...")
-                # Try alternative selectors
-                post_spans = posts_container.find_all('span', class_=re.compile(r'.*post.*'))
-            
-            news_items = []
-            
-            for post_span in post_spans[:15]:  # Limit to 15 posts
-                try:
-                    # Find title in the span
-                    title_element = post_span.find('span', class_='PostsTitle-eaTitleDesktopEllipsis')
-                    
-                    if not title_element:
-                        # Try alternative title selectors
-                        title_element = post_span.find('span', class_=re.compile(r'.*Title.*'))
-                        if not title_element:
-                            title_element = post_span.find('a')  # Sometimes title is in an anchor tag
-                    
-                    title = title_element.get_text(strip=True) if title_element else "No title found"
-                    
-                    # Try to find link
-                    link_element = post_span.find('a')
-                    link = link_element.get('href') if link_element else None
-                    if link and not link.startswith('http'):
-                        link = self.base_url.rstrip('/') + link
-                    
-                    # Try to find author and date
-                    author = "Unknown"
-                    date = "Unknown"
-                    
-                    # Look for author info
-                    author_element = post_span.find('span', class_=re.compile(r'.*Author.*')) or \
-                                  post_span.find('span', class_=re.compile(r'.*User.*'))
-                    if author_element:
-                        author = author_element.get_text(strip=True)
-                    
-                    # Look for date info
-                    date_element = post_span.find('span', class_=re.compile(r'.*Date.*')) or \
-                                 post_span.find('span', class_=re.compile(r'.*Time.*'))
-                    if date_element:
-                        date = date_element.get_text(strip=True)
-                    
-                    # Try to find excerpt/description
-                    excerpt = ""
-                    excerpt_element = post_span.find('div', class_=re.compile(r'.*Excerpt.*')) or \
-                                   post_span.find('div', class_=re.compile(r'.*Body.*'))
-                    if excerpt_element:
-                        excerpt = excerpt_element.get_text(strip=True)[:200] + "..." if len(excerpt_element.get_text(strip=True)) > 200 else excerpt_element.get_text(strip=True)
-                    
-                    news_item = {
-                        "title": title,
-                        "author": author,
-                        "date": date,
-                        "excerpt": excerpt,
-                        "link": link,
-                        "scraped_at": datetime.now().isoformat()
-                    }
-                    
-                    news_items.append(news_item)
-                    
-                except Exception as e:
-                    print(f"Error processing post: {e}")
-                    continue
-            
-            if not news_items:
-                # If no posts found, try to get any text content
-                print("No structured posts found. Getting general content...")
-                all_text = posts_container.get_text(strip=True)
-                if all_text:
-                    news_items.append({
-                        "title": "Content Found",
-                        "author": "System",
-                        "date": datetime.now().strftime("%Y-%m-%d"),
-                        "excerpt": all_text[:300] + "..." if len(all_text) > 300 else all_text,
-                        "link": self.base_url,
-                        "scraped_at": datetime.now().isoformat()
-                    })
-            
-            return {
-                "success": True,
-                "source": self.base_url,
-                "total_posts": len(news_items),
-                "posts": news_items,
-                "scraped_at": datetime.now().isoformat()
-            }
-            
-        except requests.RequestException as e:
-            return {"error": f"Request failed: {str(e)}"}
-        except Exception as e:
-            return {"error": f"Scraping failed: {str(e)}"}
-
-# Global scraper instance
-scraper = AlignmentForumScraper()
+    if leader.acquire():
+        scheduler.start()
+    else:
+        # Take over if the current leader process exits
+        threading.Thread(target=campaign, name="scheduler-leader", daemon=True).start()
+
+
+def stop_background_scraping(timeout=5):
+    """Stop scheduled scrapes and hand the leader lock to another process"""
+    scheduler.stop(timeout)
+    leader.release()
+
+
+def fetch_source(source_key):
+    """One source's latest result: scheduler snapshot, else cached or live scrape"""
+    result = scheduler.snapshot(source_key)
+    if result is None:
+        result = cache.get_or_fetch(("source", source_key),
+                                    lambda: persist(source_key, universal_scraper.scrape_source(source_key)))
+    return result
+
+
+def as_posts(result):
+    """A source result in /api/scrape's shape, with posts and total_posts for articles"""
+    if not result.get("success"):
+        return result
+    posts = {key: value for key, value in result.items() if key not in ("articles", "total_articles", "new_articles")}
+    return {**posts, "total_posts": result.get("total_articles", 0), "posts": result.get("articles", [])}
+
+
+def universal_snapshot():
+    """Combine the scheduler's per-source snapshots, or None until every source has run once"""
+    results = {key: scheduler.snapshot(key) for key in universal_scraper.sources}
+    if any(result is None for result in results.values()):
+        return None
+    return universal_scraper.combine_results(results)
+
+async def universal_data_async(session=None):
+    """/api/universal-scrape data, awaiting any live scrape on the event loop"""
+    news_data = universal_snapshot()
+    if news_data is None:
+        news_data = await cache.get_or_fetch_async(("universal-scrape", "all"),
+                                                   lambda: scrape_all_and_persist_async(session))
+    return news_data
+
+# Set per request by the ASGI entry point (asgi.py) once it has the data, so the
+# view below only shapes and serializes it
+prefetched_universal: ContextVar = ContextVar("prefetched_universal", default=None)
+# perf_counter() at which asgi.py received the request, so the latency of
+# /api/universal-scrape includes its prefetch
+request_received: ContextVar = ContextVar("request_received", default=None)
+
+# Live state sampled when /api/metrics is scraped
+BREAKER_STATES = {"closed": 0, "half_open": 1, "open": 2}
+for field, description in (("in_flight", "Requests holding one of the host's slots"),
+                           ("queued", "Requests waiting for a slot of the host"),
+                           ("blocked_for", "Seconds the host is paused for after a 429")):
+    REGISTRY.gauge(f"rate_limit_{field}", description, ["host"],
+                   lambda field=field: {(host,): stats[field] for host, stats in get_rate_limiter().stats().items()})
+REGISTRY.gauge("rate_limit_wait_seconds_total", "Seconds requests spent waiting for the rate limiter", ["host"],
+               lambda: {(host,): stats["wait_seconds_total"] for host, stats in get_rate_limiter().stats().items()},
+               kind="counter")
+REGISTRY.gauge("circuit_breaker_state", "Source circuit breaker: 0 closed, 1 half-open, 2 open", ["source"],
+               lambda: {(key,): BREAKER_STATES[status["state"]]
+                        for key, status in universal_scraper.breaker_status().items()})
+REGISTRY.gauge("scrape_cache_entries", "Results held by the scrape cache", [],
+               lambda: {(): len(cache.stats()["entries"])})
+
+@app.before_request
+def start_timer():
+    g.request_start = request_received.get() or time.perf_counter()
+
+# Registered before cache_and_compress so it runs after it and includes compression
+@app.after_request
+def observe_latency(response):
+    """Record request latency by route template, method and status"""
+    if 'request_start' in g:
+        route = request.url_rule.rule if request.url_rule else "unmatched"
+        REQUEST_SECONDS.observe(time.perf_counter() - g.request_start,
+                                route=route, method=request.method, status=response.status_code)
+    return response
+
+# Scrape results may be reused by clients for as long as the server cache keeps them fresh
+SCRAPE_ROUTES = ('/api/scrape', '/api/universal-scrape')
+
+@app.after_request
+def cache_and_compress(response):
+    """ETag, Cache-Control and compression for JSON API responses"""
+    if not request.path.startswith('/api/'):
+        return response
+    if request.path in SCRAPE_ROUTES and 'profile' not in request.args:
+        cache_control = f"public, max-age={int(cache.ttl)}"
+    else:
+        cache_control = "no-cache"
+    return finalize_json_response(response, request, cache_control)
+
+# Pages are rendered once and re-read only when their mtime changes in dev mode
+pages = PageCache(os.path.dirname(os.path.abspath(__file__)),
+                  render=lambda source: app.jinja_env.from_string(source).render(),
+                  reload=os.environ.get("PAGE_RELOAD", "0") == "1")
+
+def serve_page(filename):
+    """Cached page with its fingerprint as ETag, revalidated with If-None-Match"""
+    page = pages.get(filename)
+    response = Response(page["body"], mimetype='text/html')
+    response.set_etag(page["fingerprint"])
+    response.headers['Cache-Control'] = 'no-cache'
+    return response.make_conditional(request)
 
 @app.route('/')
 def index():
     """Serve the main HTML page"""
-    return render_template_string(open('alignment_news.html').read())
+    return serve_page('alignment_news.html')
 
 @app.route('/multi-source')
 def multi_source():
     """Serve the multi-source HTML page"""
-    return render_template_string(open('multi_source_news.html').read())
+    return serve_page('multi_source_news.html')
 
 @app.route('/api/scrape', methods=['GET'])
 def scrape_endpoint():
     """API endpoint to scrape news"""
     try:
-        news_data = scraper.scrape_news()
-        return jsonify(news_data)
+        return jsonify(as_posts(fetch_source(AF_SOURCE)))
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -166,29 +223,158 @@ def health_check():
         "service": "AI Alignment Forum Scraper"
     })
 
+@app.route('/api/ready', methods=['GET'])
+def readiness_check():
+    """Readiness: every source has a fresh snapshot to serve (always ready when scheduling is off)"""
+    missing = [key for key in universal_scraper.sources if scheduler.snapshot(key) is None] if SCHEDULING else []
+    body = {
+        "ready": not missing,
+        "missing_snapshots": missing,
+        "scheduler_role": "leader" if leader.held else "follower"
+    }
+    return jsonify(body), 200 if not missing else 503
+
 @app.route('/api/status', methods=['GET'])
 def status():
     """Get scraper status"""
     return jsonify({
         "scraper_ready": True,
-        "last_scrape": getattr(scraper, 'last_scrape', None),
-        "base_url": scraper.base_url
+        "last_scrape": scheduler.status().get(AF_SOURCE, {}).get("last_scrape"),
+        "base_url": universal_scraper.sources[AF_SOURCE]["url"],
+        "cache": cache.stats(),
+        "stored_articles": store.count(),
+        "scheduler_running": scheduler.running,
+        "scheduler_role": "leader" if leader.held else "follower",
+        "sources": scheduler.status(),
+        "rate_limits": get_rate_limiter().stats(),
+        "circuit_breakers": universal_scraper.breaker_status()
     })
 
+@app.route('/api/metrics', methods=['GET'])
+def metrics():
+    """Scrape timings, outcomes and API latency in the Prometheus text format (this process only)"""
+    return Response(REGISTRY.render(), mimetype='text/plain; version=0.0.4')
+
 @app.route('/api/universal-scrape', methods=['GET'])
 def universal_scrape():
     """Universal scraper endpoint for all AI news sources"""
     try:
-        # Import the universal scraper
-        from universal_ai_scraper import UniversalAIScraper
+        if request.args.get('profile') == '1':
+            # Live scrape with a CPU and allocation profile per source, bypassing cache and snapshots
+            if os.environ.get("SCRAPE_PROFILE_API", "0") != "1":
+                return jsonify({"error": "Profiling is disabled; set SCRAPE_PROFILE_API=1 to allow ?profile=1"}), 403
+            news_data = persist_all(universal_scraper.scrape_all_sources(deadline=0, profiler=ScrapeProfiler()))
+        else:
+            news_data = prefetched_universal.get() or universal_snapshot()
+        if news_data is None:
+            news_data = cache.get_or_fetch(("universal-scrape", "all"), scrape_all_and_persist)
         
-        universal_scraper = UniversalAIScraper()
-        news_data = universal_scraper.scrape_all_sources()
+        # ?sources=summary drops the per-source article lists already in combined_articles
+        if request.args.get('sources') == 'summary':
+            news_data = {**news_data, "sources": {
+                key: {k: v for k, v in result.items() if k != "articles"}
+                for key, result in news_data["sources"].items()
+            }}
+        fields = parse_list_arg('fields')
+        if fields:
+            news_data = {**news_data, "combined_articles": project(news_data["combined_articles"], fields)}
         
         return jsonify(news_data)
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
+def sse_event(event, data):
+    """Format one Server-Sent Events message"""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+@app.route('/api/universal-scrape/stream', methods=['GET'])
+def universal_scrape_stream():
+    """Stream each source's result as an SSE event as soon as it is ready"""
+    def generate():
+        total_articles = 0
+        pending = set(universal_scraper.sources)
+        deadline = Deadline(universal_scraper.total_deadline)
+        for source_key, result in universal_scraper.iter_results(fetch=fetch_source, deadline=deadline):
+            pending.discard(source_key)
+            if result.get("success"):
+                total_articles += result.get("total_articles", 0)
+            yield sse_event("source", {"source_key": source_key, "result": result})
+        # Sources still running at the deadline are reported instead of waited for
+        for source_key in pending:
+            yield sse_event("source", {"source_key": source_key,
+                                       "result": universal_scraper.timed_out_result(source_key)})
+        yield sse_event("done", {
+            "total_sources": len(universal_scraper.sources),
+            "total_articles": total_articles,
+            "scraped_at": datetime.now().isoformat()
+        })
+    
+    return Response(stream_with_context(generate()), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+ARTICLE_FIELDS = ("id", "title", "author", "date", "excerpt", "link", "source", "source_key", "scraped_at", "updated_at")
+
+def parse_list_arg(name):
+    """Comma-separated query parameter as a list, or None when absent"""
+    value = request.args.get(name, '')
+    return [item.strip() for item in value.split(',') if item.strip()] or None
+
+def parse_time_arg(name):
+    """ISO date or timestamp query parameter as a local ISO timestamp, like the store's, or None when absent.
+
+    Raises ValueError for anything datetime.fromisoformat cannot read.
+    """
+    value = request.args.get(name, '').strip()
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        raise ValueError(f"Invalid {name}: expected an ISO date or timestamp, got {value!r}") from None
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone().replace(tzinfo=None)
+    return parsed.isoformat()
+
+def project(items, fields):
+    """Keep only the requested fields of each article"""
+    if not fields:
+        return items
+    return [{field: item.get(field) for field in fields} for item in items]
+
+@app.route('/api/articles', methods=['GET'])
+def articles():
+    """Page through stored articles without scraping.
+
+    Query parameters: limit (max 500), cursor (from next_cursor), source
+    (comma-separated keys), since / until (ISO date or timestamp on
+    scraped_at) and fields (comma-separated projection).
+    """
+    fields = parse_list_arg('fields')
+    unknown = [field for field in fields or [] if field not in ARTICLE_FIELDS]
+    if unknown:
+        return jsonify({"error": f"Unknown fields: {', '.join(unknown)}"}), 400
+    
+    try:
+        limit = max(1, min(request.args.get('limit', 50, type=int), 500))
+        items, next_cursor = store.query(
+            limit=limit,
+            cursor=request.args.get('cursor'),
+            sources=parse_list_arg('source'),
+            since=parse_time_arg('since'),
+            until=parse_time_arg('until')
+        )
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+    
+    return jsonify({
+        "success": True,
+        "total_articles": len(items),
+        "articles": project(items, fields),
+        "next_cursor": next_cursor
+    })
+
 if __name__ == '__main__':
     print("🚀 Starting AI Alignment Forum News Scraper...")
     print("📱 Frontend: http://localhost:5001")
@@ -196,4 +382,11 @@ if __name__ == '__main__':
     print("💚 Health: http://localhost:5001/api/health")
     print("\nPress Ctrl+C to stop the server")
     
+    # The dev server reloads pages from disk when they change
+    pages.reload = True
+    
+    # With the debug reloader only the child process (WERKZEUG_RUN_MAIN) should scrape
+    if os.environ.get("WERKZEUG_RUN_MAIN") == "true":
+        start_background_scraping()
+    
     app.run(debug=True, host='0.0.0.0', port=5001)
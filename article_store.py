@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Persistent article store
+Keeps every scraped article in SQLite, keyed by a hash of its normalized URL.
+Scrapes upsert only new or changed articles, so history accumulates instead
+of being overwritten, and recent articles can be read without scraping.
+"""
+
+import base64
+import binascii
+import hashlib
+import os
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    url_hash     TEXT PRIMARY KEY,
+    link         TEXT,
+    source_key   TEXT NOT NULL,
+    source       TEXT,
+    title        TEXT NOT NULL,
+    author       TEXT,
+    date         TEXT,
+    excerpt      TEXT,
+    content_hash TEXT NOT NULL,
+    first_seen   TEXT NOT NULL,
+    updated_at   TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS articles_by_first_seen ON articles (first_seen, url_hash);
+CREATE INDEX IF NOT EXISTS articles_by_source ON articles (source_key, first_seen, url_hash);
+"""
+
+# Values scrapers emit when a field could not be found
+PLACEHOLDERS = (None, "", "Unknown")
+MERGED_FIELDS = ("author", "date", "excerpt")
+
+# Query parameters that only track the click and never change the article
+TRACKING_PREFIXES = ("utm_",)
+TRACKING_PARAMS = frozenset(["fbclid", "gclid", "ref"])
+
+
+def normalize_url(url: str) -> str:
+    """Canonical form of an article URL: lowercase host, no fragment or tracking params"""
+    parts = urlsplit(url.strip())
+    query = [(k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+             if not k.lower().startswith(TRACKING_PREFIXES) and k.lower() not in TRACKING_PARAMS]
+    path = parts.path.rstrip('/') or '/'
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, urlencode(sorted(query)), ''))
+
+
+def article_key(article: Dict[str, Any], source_key: str) -> str:
+    """Stable id for an article: its normalized URL, or source and title when it has no link"""
+    basis = normalize_url(article["link"]) if article.get("link") else f"{source_key}\n{article.get('title', '')}"
+    return hashlib.sha1(basis.encode('utf-8')).hexdigest()
+
+
+def _content_hash(article: Dict[str, Any]) -> str:
+    fields = (article.get("title"), article.get("author"), article.get("date"), article.get("excerpt"))
+    return hashlib.sha1("\x1f".join(str(f or "") for f in fields).encode('utf-8')).hexdigest()
+
+
+def encode_cursor(first_seen: str, url_hash: str) -> str:
+    return base64.urlsafe_b64encode(f"{first_seen}|{url_hash}".encode('utf-8')).decode('ascii')
+
+
+def decode_cursor(cursor: str) -> Tuple[str, str]:
+    """Inverse of encode_cursor; raises ValueError for malformed cursors"""
+    try:
+        first_seen, url_hash = base64.urlsafe_b64decode(cursor.encode('ascii')).decode('utf-8').split("|", 1)
+    except (UnicodeError, binascii.Error, ValueError):
+        raise ValueError(f"Invalid cursor: {cursor}")
+    return first_seen, url_hash
+
+
+class ArticleStore:
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or os.environ.get("ARTICLE_STORE_PATH", "articles.db")
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        """One connection per thread; WAL lets readers run while a scrape writes"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def upsert(self, source_key: str, articles: List[Dict[str, Any]]) -> Dict[str, int]:
+        """Insert new articles and rewrite changed ones; unchanged rows are not touched"""
+        counts = {"new": 0, "updated": 0, "unchanged": 0}
+        if not articles:
+            return counts
+
+        rows = {article_key(a, source_key): a for a in articles if a.get("title")}
+        now = datetime.now().isoformat()
+        conn = self._connect()
+        with conn:
+            placeholders = ",".join("?" * len(rows))
+            existing = {
+                row["url_hash"]: row
+                for row in conn.execute(f"SELECT * FROM articles WHERE url_hash IN ({placeholders})", list(rows))
+            }
+            for url_hash, article in rows.items():
+                previous = existing.get(url_hash)
+                if previous is not None:
+                    # A poorer scrape of the same article must not erase known fields
+                    article = {**article, **{
+                        field: previous[field] for field in MERGED_FIELDS
+                        if article.get(field) in PLACEHOLDERS and previous[field] not in PLACEHOLDERS
+                    }}
+                content_hash = _content_hash(article)
+                if previous is not None and previous["content_hash"] == content_hash:
+                    counts["unchanged"] += 1
+                    continue
+                counts["updated" if previous is not None else "new"] += 1
+                conn.execute(
+                    """INSERT INTO articles (url_hash, link, source_key, source, title, author, date, excerpt,
+                                             content_hash, first_seen, updated_at)
+                       VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                       ON CONFLICT (url_hash) DO UPDATE SET
+                           title = excluded.title, author = excluded.author, date = excluded.date,
+                           excerpt = excluded.excerpt, content_hash = excluded.content_hash,
+                           updated_at = excluded.updated_at""",
+                    (url_hash, article.get("link"), source_key, article.get("source"), article["title"],
+                     article.get("author"), article.get("date"), article.get("excerpt"),
+                     content_hash, article.get("scraped_at") or now, now))
+        return counts
+
+    def query(self, limit: int = 50, cursor: Optional[str] = None, sources: Optional[List[str]] = None,
+              since: Optional[str] = None, until: Optional[str] = None) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """One page of articles, newest first, plus the cursor for the next page.
+
+        Pages are keyed on (first_seen, url_hash), so articles stored while a
+        client is paging do not shift or repeat results. `since` / `until`
+        bound first_seen as ISO timestamps or dates.
+        """
+        clauses: List[str] = []
+        params: List[Any] = []
+        if sources:
+            clauses.append(f"source_key IN ({','.join('?' * len(sources))})")
+            params.extend(sources)
+        if since:
+            clauses.append("first_seen >= ?")
+            params.append(since)
+        if until:
+            clauses.append("first_seen < ?")
+            params.append(until)
+        if cursor:
+            first_seen, url_hash = decode_cursor(cursor)
+            clauses.append("(first_seen < ? OR (first_seen = ? AND url_hash < ?))")
+            params.extend([first_seen, first_seen, url_hash])
+
+        query = "SELECT * FROM articles"
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+        query += " ORDER BY first_seen DESC, url_hash DESC LIMIT ?"
+        # Fetch one extra row to know whether another page exists
+        params.append(limit + 1)
+
+        rows = self._connect().execute(query, params).fetchall()
+        next_cursor = encode_cursor(rows[limit - 1]["first_seen"], rows[limit - 1]["url_hash"]) if len(rows) > limit else None
+        return [self._row_to_article(row) for row in rows[:limit]], next_cursor
+
+    def recent(self, limit: int = 50, source_key: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Most recently discovered articles, newest first"""
+        return self.query(limit=limit, sources=[source_key] if source_key else None)[0]
+
+    def count(self) -> int:
+        return self._connect().execute("SELECT COUNT(*) FROM articles").fetchone()[0]
+
+    @staticmethod
+    def _row_to_article(row: sqlite3.Row) -> Dict[str, Any]:
+        return {
+            "id": row["url_hash"],
+            "title": row["title"],
+            "author": row["author"],
+            "date": row["date"],
+            "excerpt": row["excerpt"],
+            "link": row["link"],
+            "source": row["source"],
+            "source_key": row["source_key"],
+            "scraped_at": row["first_seen"],
+            "updated_at": row["updated_at"],
+        }
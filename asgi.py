@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+ASGI entry point for production servers
+    uvicorn asgi:application --port 5001
+    gunicorn -c gunicorn.conf.py -k uvicorn.workers.UvicornWorker asgi:application
+/api/universal-scrape scrapes on the event loop with aiohttp, so one worker
+keeps any number of those requests in flight without a thread each; Flask
+then only shapes and serializes the result. Every other route runs in Flask
+on the loop's thread pool.
+"""
+
+import asyncio
+import json
+import time
+from urllib.parse import parse_qs
+
+from asgiref.sync import sync_to_async
+from asgiref.wsgi import WsgiToAsgiInstance
+
+from app import (app, prefetched_universal, request_received, start_background_scraping,
+                 stop_background_scraping, universal_data_async)
+from http_client import create_async_session
+from metrics import REQUEST_SECONDS
+
+ASYNC_ROUTES = ('/api/universal-scrape',)
+
+# asgiref runs every WSGI call in one shared thread: run_wsgi_app is a method
+# wrapped in sync_to_async(thread_sensitive=True). Rewrap the plain method with
+# thread_sensitive=False so calls use the loop's thread pool. The lookup is
+# guarded (and asgiref pinned below 4); without it requests fall back to the
+# shared thread, which is slower but correct.
+_run_wsgi_app = getattr(WsgiToAsgiInstance.__dict__.get('run_wsgi_app'), 'func', None)
+
+
+class _WsgiInstance(WsgiToAsgiInstance):
+    if callable(_run_wsgi_app):
+        run_wsgi_app = sync_to_async(_run_wsgi_app, thread_sensitive=False)
+
+
+# aiohttp session of this worker's event loop, opened at startup
+session = None
+
+
+async def lifespan(receive, send):
+    global session
+    while True:
+        message = await receive()
+        if message["type"] == "lifespan.startup":
+            session = create_async_session()
+            start_background_scraping()
+            await send({"type": "lifespan.startup.complete"})
+        elif message["type"] == "lifespan.shutdown":
+            await asyncio.to_thread(stop_background_scraping)
+            await session.close()
+            await send({"type": "lifespan.shutdown.complete"})
+            return
+
+
+async def send_json(send, status, data):
+    body = json.dumps(data).encode('utf-8')
+    await send({"type": "http.response.start", "status": status,
+                "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())]})
+    await send({"type": "http.response.body", "body": body})
+
+
+async def application(scope, receive, send):
+    if scope["type"] == "lifespan":
+        return await lifespan(receive, send)
+    
+    if scope["type"] == "http":
+        request_received.set(time.perf_counter())
+    
+    # Profiled scrapes (?profile=1) run synchronously in the Flask view
+    if (scope["type"] == "http" and scope["method"] == "GET" and scope["path"] in ASYNC_ROUTES
+            and "profile" not in parse_qs(scope.get("query_string", b"").decode())):
+        try:
+            prefetched_universal.set(await universal_data_async(session))
+        except Exception as e:
+            REQUEST_SECONDS.observe(time.perf_counter() - request_received.get(),
+                                    route=scope["path"], method="GET", status=500)
+            return await send_json(send, 500, {"error": str(e)})
+    
+    await _WsgiInstance(app)(scope, receive, send)
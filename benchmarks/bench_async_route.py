@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+Load test: /api/universal-scrape served by WSGI threads vs the ASGI entry point
+Starts a local stand-in for the four upstream sites that answers after
+`--delay` seconds, then serves the app twice against it: under gunicorn with
+one gthread worker of `--threads` threads (wsgi:application), and under
+uvicorn with one worker (asgi:application). Each run fires `--clients`
+concurrent clients at /api/universal-scrape, with the scheduler, per-host
+rate limiting and cached results off, while a probe times /api/health.
+Nothing is served from cache, but ScrapeCache still merges concurrent
+identical requests into one in-flight scrape, as it does in production, so
+each wave of clients shares a scrape rather than starting one per request.
+
+Usage:
+    python benchmarks/bench_async_route.py
+    python benchmarks/bench_async_route.py --clients 64 --delay 0.5 --json
+"""
+
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import requests
+
+LISTING = ('<html><body><div class="PostsList2-postsBoxShadow">{items}</div>'
+           '<div class="td_module_flex">{items}</div></body></html>')
+ITEM = '<article class="post"><span class="post_{i}"><h3><a href="/story-{i}">Stand-in headline number {i}</a></h3></span></article>'
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_upstream(delay: float) -> ThreadingHTTPServer:
+    """Slow stand-in for the scraped sites: every path gets the same listing page"""
+    body = LISTING.format(items="".join(ITEM.format(i=i) for i in range(15))).encode()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            time.sleep(delay)
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", free_port()), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def serve(mode: str, upstream: str, port: int, threads: int):
+    """Child process: point every source at the stand-in and run one server"""
+    from app import app, universal_scraper
+
+    universal_scraper.use_feeds = False
+    for source_key, source in universal_scraper.sources.items():
+        source["url"] = f"{upstream}/{source_key}"
+
+    if mode == "asgi":
+        import uvicorn
+        from asgi import application
+        uvicorn.run(application, host="127.0.0.1", port=port, log_level="warning")
+        return
+
+    from gunicorn.app.base import BaseApplication
+
+    class Server(BaseApplication):
+        def load_config(self):
+            for key, value in {"bind": f"127.0.0.1:{port}", "workers": 1, "worker_class": "gthread",
+                               "threads": threads, "loglevel": "warning"}.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            return app
+
+    Server().run()
+
+
+def wait_ready(base: str, timeout: float = 30):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            if requests.get(f"{base}/api/health", timeout=1).ok:
+                return
+        except requests.RequestException:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"Server at {base} did not start")
+
+
+def percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    return round(ordered[min(len(ordered) - 1, int(len(ordered) * pct))] * 1000, 1)
+
+
+def load(base: str, clients: int, requests_per_client: int) -> Dict:
+    latencies: List[float] = []
+    probe_latencies: List[float] = []
+    errors = 0
+    lock = threading.Lock()
+    done = threading.Event()
+
+    def client():
+        nonlocal errors
+        session = requests.Session()
+        for _ in range(requests_per_client):
+            start = time.perf_counter()
+            try:
+                ok = session.get(f"{base}/api/universal-scrape", timeout=120).ok
+            except requests.RequestException:
+                ok = False
+            with lock:
+                latencies.append(time.perf_counter() - start)
+                errors += not ok
+
+    def probe():
+        session = requests.Session()
+        while not done.is_set():
+            start = time.perf_counter()
+            try:
+                session.get(f"{base}/api/health", timeout=120)
+            except requests.RequestException:
+                pass
+            probe_latencies.append(time.perf_counter() - start)
+            done.wait(0.1)
+
+    prober = threading.Thread(target=probe, daemon=True)
+    workers = [threading.Thread(target=client) for _ in range(clients)]
+    start = time.perf_counter()
+    prober.start()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - start
+    done.set()
+    prober.join()
+
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "seconds": round(elapsed, 2),
+        "requests_per_second": round(len(latencies) / elapsed, 2),
+        "p50_ms": percentile(latencies, 0.5),
+        "p95_ms": percentile(latencies, 0.95),
+        "max_ms": round(max(latencies) * 1000, 1),
+        "health_p95_ms": percentile(probe_latencies, 0.95),
+        "health_mean_ms": round(statistics.mean(probe_latencies) * 1000, 1),
+    }
+
+
+def run(args) -> List[Dict]:
+    upstream = start_upstream(args.delay)
+    upstream_url = f"http://127.0.0.1:{upstream.server_address[1]}"
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        env = {**os.environ, "SCRAPE_SCHEDULER": "0", "SCRAPE_CACHE_TTL": "0", "SCRAPE_CACHE_STALE_TTL": "0",
+               "SCRAPE_RATE_PER_HOST": "0", "SCRAPE_MAX_IN_FLIGHT_PER_HOST": "0",
+               "ARTICLE_STORE_PATH": os.path.join(tmp, "articles.db"),
+               "SCHEDULER_LOCK_PATH": os.path.join(tmp, "scheduler.lock")}
+        for mode in ("wsgi", "asgi"):
+            port = free_port()
+            child = subprocess.Popen(
+                [sys.executable, os.path.abspath(__file__), "--serve", mode, "--upstream", upstream_url,
+                 "--port", str(port), "--threads", str(args.threads)],
+                cwd=ROOT, env=env, stdout=subprocess.DEVNULL)
+            try:
+                base = f"http://127.0.0.1:{port}"
+                wait_ready(base)
+                rows.append({"mode": mode, **load(base, args.clients, args.requests)})
+            finally:
+                child.terminate()
+                child.wait(timeout=30)
+    upstream.shutdown()
+    return rows
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("--clients", type=int, default=32)
+    arg_parser.add_argument("--requests", type=int, default=4, help="requests per client")
+    arg_parser.add_argument("--delay", type=float, default=1.0, help="upstream response delay in seconds")
+    arg_parser.add_argument("--threads", type=int, default=8, help="gthread threads of the WSGI worker")
+    arg_parser.add_argument("--json", action="store_true", help="print results as JSON")
+    arg_parser.add_argument("--serve", choices=["wsgi", "asgi"], help=argparse.SUPPRESS)
+    arg_parser.add_argument("--upstream", help=argparse.SUPPRESS)
+    arg_parser.add_argument("--port", type=int, help=argparse.SUPPRESS)
+    args = arg_parser.parse_args()
+
+    if args.serve:
+        serve(args.serve, args.upstream, args.port, args.threads)
+        return
+
+    rows = run(args)
+    if args.json:
+        print(json.dumps(rows, indent=2))
+        return
+
+    print(f"{'mode':>5} {'requests':>9} {'errors':>7} {'req/s':>7} {'p50 ms':>8} {'p95 ms':>8} "
+          f"{'max ms':>8} {'health p95 ms':>14}")
+    for row in rows:
+        print(f"{row['mode']:>5} {row['requests']:>9} {row['errors']:>7} {row['requests_per_second']:>7} "
+              f"{row['p50_ms']:>8} {row['p95_ms']:>8} {row['max_ms']:>8} {row['health_p95_ms']:>14}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Fallback extraction benchmark
+Times the old whole-document fallback (every div with a class, regex-matched)
+against extractors.discover_candidates on listing pages of growing size where
+no primary selector matches. Pages are parsed once up front; only extraction
+is timed.
+
+Each size is measured twice: with the headlines before the filler markup,
+where discovery stops after the first few nodes, and with them after it,
+where discovery has to walk the filler first and still grows with the page.
+
+Usage:
+    python benchmarks/bench_fallback.py
+    python benchmarks/bench_fallback.py --sizes 1000 10000 50000 --json
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from typing import Callable, Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bs4 import BeautifulSoup
+from extractors import discover_candidates
+
+
+def listing_page(noise: int, items: int = 20, late: bool = False) -> bytes:
+    """Headline list and `noise` blocks of unrelated markup, the headlines last when late is set"""
+    listing = "".join(
+        f'<div class="tile"><h3><a href="/story-{i}">Fallback headline number {i}</a></h3><p>Teaser {i}</p></div>'
+        for i in range(items)
+    )
+    filler = "".join(
+        f'<div class="widget-{n % 13}"><div class="inner"><span>Widget text {n}</span></div></div>'
+        for n in range(noise)
+    )
+    body = filler + listing if late else listing + filler
+    return f'<html><body><nav><h2><a href="/">Home page link</a></h2></nav>{body}</body></html>'.encode()
+
+
+def legacy_fallback(soup: BeautifulSoup, limit: int = 10) -> List[str]:
+    """The pre-discovery fallback: every classed div, then headings of the first few"""
+    titles = []
+    for article in soup.find_all('div', class_=re.compile(r'.*'))[:limit]:
+        title_element = article.find(['h3', 'h2', 'h1']) or article.find('a', href=True)
+        if title_element:
+            titles.append(title_element.get_text(strip=True))
+    return titles
+
+
+def discovery_fallback(soup: BeautifulSoup, limit: int = 10) -> List[str]:
+    return [candidate["title"] for candidate in discover_candidates(soup, limit)]
+
+
+def best_of(func: Callable, soup: BeautifulSoup, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(soup)
+        timings.append(time.perf_counter() - start)
+    return round(min(timings) * 1000, 3)
+
+
+def measure(noise: int, late: bool, repeat: int) -> Dict:
+    content = listing_page(noise, late=late)
+    soup = BeautifulSoup(content, "lxml")
+    return {
+        "headlines": "late" if late else "early",
+        "noise_blocks": noise,
+        "bytes": len(content),
+        "legacy_ms": best_of(legacy_fallback, soup, repeat),
+        "discovery_ms": best_of(discovery_fallback, soup, repeat),
+        "discovery_found": len(discovery_fallback(soup)),
+    }
+
+
+def run(sizes: List[int], repeat: int) -> List[Dict]:
+    rows = []
+    for late in (False, True):
+        for noise in sizes:
+            rows.append(measure(noise, late, repeat))
+    return rows
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 5000, 20000])
+    arg_parser.add_argument("--repeat", type=int, default=3)
+    arg_parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = arg_parser.parse_args()
+
+    rows = run(args.sizes, args.repeat)
+    if args.json:
+        print(json.dumps(rows, indent=2))
+        return
+
+    print(f"{'headlines':>9} {'noise blocks':>12} {'bytes':>9} {'legacy ms':>10} {'discovery ms':>13} {'found':>6}")
+    for row in rows:
+        print(f"{row['headlines']:>9} {row['noise_blocks']:>12} {row['bytes']:>9} {row['legacy_ms']:>10} "
+              f"{row['discovery_ms']:>13} {row['discovery_found']:>6}")
+
+
+if __name__ == "__main__":
+    main()
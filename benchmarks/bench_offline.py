@@ -0,0 +1,367 @@
+#!/usr/bin/env python3
+"""
+Offline scraper benchmark
+`record` saves every source's listing page (and feed, where it has one) to a
+fixtures directory. `run` serves those fixtures from a local stand-in server
+and times UniversalAIScraper (HTML and feed paths) and each standalone
+scraper against it: fetch, parse and extract time per source, articles
+found and peak traced memory. Without recorded fixtures, synthetic pages are
+served instead.
+
+Stage times come from wrapping the scraper module's fetch_page / make_soup /
+parse_feed; extract is the rest of the scrape. Feeds are parsed while they
+download, so their parse time includes the body and fetch is not split out.
+
+Results can be saved with --output and checked against an earlier run with
+--compare, which exits non-zero when a stage got slower than --tolerance
+allows or a scraper returns a different number of articles.
+
+Usage:
+    python benchmarks/bench_offline.py record
+    python benchmarks/bench_offline.py run --output before.json
+    python benchmarks/bench_offline.py run --compare before.json --tolerance 0.2
+"""
+
+import argparse
+import io
+import json
+import os
+import platform
+import socket
+import subprocess
+import sys
+import threading
+import time
+import tracemalloc
+from collections import defaultdict
+from contextlib import contextmanager, redirect_stdout
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# The stand-in server is local: no per-host throttling or retries
+os.environ.setdefault("SCRAPE_RATE_PER_HOST", "0")
+os.environ.setdefault("SCRAPE_MAX_IN_FLIGHT_PER_HOST", "0")
+os.environ.setdefault("SCRAPE_RETRIES", "0")
+
+import requests
+
+import scrape_alignment_forum
+import scrape_marktechpost
+import scrape_mit_news
+import scrape_towards_ai
+import universal_ai_scraper
+from bench_parsing import synthetic_page
+from universal_ai_scraper import UniversalAIScraper
+
+DEFAULT_FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+STANDALONE = {
+    "ai_alignment_forum": (scrape_alignment_forum, "AlignmentForumScraper"),
+    "mit_news": (scrape_mit_news, "MITNewsScraper"),
+    "towards_ai": (scrape_towards_ai, "TowardsAIScraper"),
+    "marktechpost": (scrape_marktechpost, "MarkTechPostScraper"),
+}
+
+# Metrics checked by --compare, with the smallest change worth reporting
+COMPARED = {"fetch_ms": 1.0, "parse_ms": 1.0, "extract_ms": 1.0, "total_ms": 2.0, "peak_mb": 0.5}
+
+
+def synthetic_feed(source_key: str, items: int = 30) -> bytes:
+    entries = "".join(
+        f"<item><title>{source_key} feed entry {i}</title><link>https://example.com/{source_key}/{i}</link>"
+        f"<pubDate>Mon, 01 Sep 2025 12:{i % 60:02d}:00 GMT</pubDate>"
+        f"<description>&lt;p&gt;Summary of entry {i}&lt;/p&gt;</description></item>"
+        for i in range(items)
+    )
+    return f'<?xml version="1.0"?><rss version="2.0"><channel><title>{source_key}</title>{entries}</channel></rss>'.encode()
+
+
+def record(fixtures_dir: str):
+    """Download every source's listing page and feed into fixtures_dir"""
+    scraper = UniversalAIScraper()
+    os.makedirs(fixtures_dir, exist_ok=True)
+    manifest = {}
+    for source_key, source in scraper.sources.items():
+        entry = {"recorded_at": datetime.now().isoformat()}
+        for kind, field, filename in (("page", "url", f"{source_key}.html"),
+                                      ("feed", "feed_url", f"{source_key}.feed.xml")):
+            url = source.get(field)
+            if not url:
+                continue
+            try:
+                response = requests.get(url, headers=scraper.headers, timeout=30)
+                response.raise_for_status()
+            except requests.RequestException as e:
+                print(f"⚠️ Could not record {source_key} {kind}: {e}")
+                continue
+            with open(os.path.join(fixtures_dir, filename), "wb") as f:
+                f.write(response.content)
+            entry[kind] = {"url": url, "file": filename, "bytes": len(response.content)}
+            print(f"💾 {source_key} {kind}: {len(response.content)} bytes")
+        manifest[source_key] = entry
+    with open(os.path.join(fixtures_dir, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+
+
+def load_fixtures(fixtures_dir: str) -> Dict[str, Dict[str, bytes]]:
+    """{source_key: {"page": bytes, "feed": bytes}} from recorded files, else synthetic"""
+    sources = UniversalAIScraper().sources
+    manifest_path = os.path.join(fixtures_dir, "manifest.json")
+    if not os.path.exists(manifest_path):
+        return {source_key: {"page": synthetic_page(source_key),
+                             **({"feed": synthetic_feed(source_key)} if source.get("feed_url") else {})}
+                for source_key, source in sources.items()}
+
+    with open(manifest_path, encoding="utf-8") as f:
+        manifest = json.load(f)
+    fixtures = {}
+    for source_key, entry in manifest.items():
+        fixtures[source_key] = {}
+        for kind in ("page", "feed"):
+            if kind in entry:
+                with open(os.path.join(fixtures_dir, entry[kind]["file"]), "rb") as f:
+                    fixtures[source_key][kind] = f.read()
+    return fixtures
+
+
+def start_server(fixtures: Dict[str, Dict[str, bytes]]) -> ThreadingHTTPServer:
+    """Serve /<source_key> (listing page) and /<source_key>/feed from memory"""
+    routes = {}
+    for source_key, files in fixtures.items():
+        if "page" in files:
+            routes[f"/{source_key}"] = (files["page"], "text/html; charset=utf-8")
+        if "feed" in files:
+            routes[f"/{source_key}/feed"] = (files["feed"], "application/rss+xml")
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def setup(self):
+            super().setup()
+            # Headers and body go out as separate writes; don't let Nagle hold the body back
+            self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+        def do_GET(self):
+            body, content_type = routes.get(self.path, (b"", None))
+            self.send_response(200 if content_type else 404)
+            self.send_header("Content-Type", content_type or "text/plain")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+class StageTimer:
+    """Adds the time spent in wrapped module functions to named stages"""
+
+    def __init__(self):
+        self.seconds: Dict[str, float] = defaultdict(float)
+
+    def _wrap(self, stage: str, func: Callable) -> Callable:
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.seconds[stage] += time.perf_counter() - start
+        return timed
+
+    @contextmanager
+    def patch(self, module, stages: Dict[str, str]):
+        """Time module.<attribute> as <stage> for each stage -> attribute pair"""
+        originals = {attribute: getattr(module, attribute) for attribute in stages.values()}
+        for stage, attribute in stages.items():
+            setattr(module, attribute, self._wrap(stage, originals[attribute]))
+        try:
+            yield
+        finally:
+            for attribute, func in originals.items():
+                setattr(module, attribute, func)
+
+
+class Case:
+    def __init__(self, scraper: str, source: str, via: str, run: Callable[[], Dict], module, stages: Dict[str, str],
+                 size: int):
+        self.scraper = scraper
+        self.source = source
+        self.via = via
+        self.run = run
+        self.module = module
+        self.stages = stages
+        self.size = size
+
+
+def build_cases(fixtures: Dict[str, Dict[str, bytes]], base: str) -> List[Case]:
+    cases = []
+    for use_feeds, via in ((False, "html"), (True, "feed")):
+        scraper = UniversalAIScraper(max_workers=1, use_feeds=use_feeds)
+        kind = "feed" if use_feeds else "page"
+        for source_key, files in fixtures.items():
+            if kind not in files:
+                continue
+            scraper.sources[source_key]["url"] = f"{base}/{source_key}"
+            scraper.sources[source_key]["feed_url"] = f"{base}/{source_key}/feed" if use_feeds else None
+            stages = {"parse": "parse_feed"} if use_feeds else {"fetch": "fetch_page", "parse": "make_soup"}
+            cases.append(Case("universal", source_key, via,
+                              lambda scraper=scraper, key=source_key: scraper.scrape_source(key),
+                              universal_ai_scraper, stages, len(files[kind])))
+
+    for source_key, (module, class_name) in STANDALONE.items():
+        if "page" not in fixtures.get(source_key, {}):
+            continue
+        instance = getattr(module, class_name)()
+        instance.base_url = f"{base}/{source_key}"
+        cases.append(Case("standalone", source_key, "html", instance.scrape_news, module,
+                          {"fetch": "fetch_page", "parse": "make_soup"}, len(fixtures[source_key]["page"])))
+    return cases
+
+
+def ms(seconds: Optional[float]) -> Optional[float]:
+    return None if seconds is None else round(seconds * 1000, 2)
+
+
+def measure(case: Case, repeat: int) -> Dict:
+    """Best-of-repeat stage times after a warm-up scrape, then one traced scrape for memory"""
+    timer = StageTimer()
+    runs = []
+    with redirect_stdout(io.StringIO()), timer.patch(case.module, case.stages):
+        result = case.run()
+        for _ in range(repeat):
+            timer.seconds.clear()
+            start = time.perf_counter()
+            case.run()
+            total = time.perf_counter() - start
+            runs.append({"total": total, **timer.seconds})
+
+        tracemalloc.start()
+        case.run()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    def best(stage: str) -> Optional[float]:
+        if stage not in case.stages:
+            return None
+        return min(run.get(stage, 0.0) for run in runs)
+
+    total = min(run["total"] for run in runs)
+    extract = total - sum(best(stage) for stage in case.stages)
+    return {
+        "scraper": case.scraper,
+        "source": case.source,
+        "via": case.via,
+        "bytes": case.size,
+        # The standalone Alignment Forum scraper reports posts rather than articles
+        "articles": result.get("total_articles", result.get("total_posts", 0)),
+        "error": result.get("error"),
+        "fetch_ms": ms(best("fetch")),
+        "parse_ms": ms(best("parse")),
+        "extract_ms": ms(max(0.0, extract)),
+        "total_ms": ms(total),
+        "peak_mb": round(peak / 1024 / 1024, 2),
+    }
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(fixtures_dir: str, repeat: int) -> Dict:
+    fixtures = load_fixtures(fixtures_dir)
+    server = start_server(fixtures)
+    try:
+        base = f"http://127.0.0.1:{server.server_address[1]}"
+        rows = [measure(case, repeat) for case in build_cases(fixtures, base)]
+    finally:
+        server.shutdown()
+    recorded = os.path.exists(os.path.join(fixtures_dir, "manifest.json"))
+    return {
+        "meta": {
+            "created_at": datetime.now().isoformat(),
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "fixtures": os.path.abspath(fixtures_dir) if recorded else "synthetic",
+            "repeat": repeat,
+        },
+        "results": rows,
+    }
+
+
+def compare(baseline: Dict, current: Dict, tolerance: float) -> List[str]:
+    """Regressions of current against baseline, as readable lines"""
+    before = {(row["scraper"], row["source"], row["via"]): row for row in baseline["results"]}
+    problems = []
+    for row in current["results"]:
+        old = before.get((row["scraper"], row["source"], row["via"]))
+        if old is None:
+            continue
+        name = f"{row['scraper']}/{row['source']}/{row['via']}"
+        if row["articles"] != old["articles"]:
+            problems.append(f"{name}: {old['articles']} -> {row['articles']} articles")
+        for metric, min_change in COMPARED.items():
+            new_value, old_value = row.get(metric), old.get(metric)
+            if new_value is None or old_value is None:
+                continue
+            if new_value - old_value > max(min_change, old_value * tolerance):
+                problems.append(f"{name}: {metric} {old_value} -> {new_value}")
+    return problems
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("command", choices=["record", "run"])
+    arg_parser.add_argument("--fixtures", default=DEFAULT_FIXTURES, help="directory of recorded pages")
+    arg_parser.add_argument("--repeat", type=int, default=5)
+    arg_parser.add_argument("--output", help="also write results as JSON to this file")
+    arg_parser.add_argument("--compare", help="results file of an earlier run to check for regressions")
+    arg_parser.add_argument("--tolerance", type=float, default=0.25,
+                            help="allowed slowdown against --compare as a fraction (default 0.25)")
+    arg_parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = arg_parser.parse_args()
+
+    if args.command == "record":
+        record(args.fixtures)
+        return
+
+    report = run(args.fixtures, args.repeat)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(f"fixtures: {report['meta']['fixtures']}  commit: {report['meta']['commit']}")
+        print(f"{'scraper':<11} {'source':<19} {'via':<5} {'bytes':>8} {'articles':>9} {'fetch ms':>9} "
+              f"{'parse ms':>9} {'extract ms':>11} {'total ms':>9} {'peak MB':>8}")
+        for row in report["results"]:
+            print(f"{row['scraper']:<11} {row['source']:<19} {row['via']:<5} {row['bytes']:>8} {row['articles']:>9} "
+                  f"{str(row['fetch_ms'] if row['fetch_ms'] is not None else '-'):>9} {row['parse_ms']:>9} "
+                  f"{row['extract_ms']:>11} {row['total_ms']:>9} {row['peak_mb']:>8}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            problems = compare(json.load(f), report, args.tolerance)
+        for problem in problems:
+            print(f"❌ {problem}", file=sys.stderr)
+        if problems:
+            sys.exit(1)
+        print(f"✅ No regressions against {args.compare}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
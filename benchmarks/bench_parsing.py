@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Parsing benchmark
+Compares parse time and peak memory of html.parser, lxml and lxml restricted
+to each source's post-list region (parsing.PARSE_REGIONS).
+
+Usage:
+    python benchmarks/bench_parsing.py                          # synthetic pages
+    python benchmarks/bench_parsing.py mit_news=saved/mit.html  # saved pages
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+from typing import Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bs4 import BeautifulSoup
+from parsing import PARSE_REGIONS
+
+# (label, parser, restrict to region)
+MODES = [
+    ("html.parser", "html.parser", False),
+    ("lxml", "lxml", False),
+    ("lxml+region", "lxml", True),
+]
+
+ITEM_MARKUP = {
+    "ai_alignment_forum": '<span class="post_{i}"><span class="PostsTitle-eaTitleDesktopEllipsis"><a href="/posts/{i}">Post title number {i}</a></span></span>',
+    "mit_news": '<article class="term-page--news-article--item"><h3><a href="/2025/story-{i}">MIT story headline number {i}</a></h3></article>',
+    "towards_ai": '<article class="post-card"><h3><a href="/p/post-{i}">Towards AI post headline {i}</a></h3></article>',
+    "marktechpost": '<article class="td_module_flex entry"><h3><a href="/2025/entry-{i}">MarkTechPost entry headline {i}</a></h3></article>',
+}
+
+
+def synthetic_page(source_key: str, items: int = 30, noise: int = 3000) -> bytes:
+    """Listing page with a post-list region buried in unrelated markup"""
+    filler = "".join(
+        f'<div class="nav-{n % 17}"><ul><li><span class="menu">Menu item {n}</span></li></ul><p>Sidebar text {n}</p></div>'
+        for n in range(noise)
+    )
+    listing = "".join(ITEM_MARKUP[source_key].format(i=i) for i in range(items))
+    if source_key == "ai_alignment_forum":
+        listing = f'<div class="PostsList2-postsBoxShadow">{listing}</div>'
+    else:
+        listing = f'<section class="listing">{listing}</section>'
+    return f"<html><head><title>{source_key}</title></head><body>{filler}{listing}{filler}</body></html>".encode()
+
+
+def measure(content: bytes, parser: str, strainer, repeat: int) -> Dict[str, float]:
+    """Best-of-repeat parse time and peak traced memory for one mode"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        BeautifulSoup(content, parser, parse_only=strainer)
+        timings.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    BeautifulSoup(content, parser, parse_only=strainer)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {"parse_ms": round(min(timings) * 1000, 2), "peak_mb": round(peak / 1024 / 1024, 2)}
+
+
+def run(pages: Dict[str, bytes], repeat: int) -> List[Dict]:
+    rows = []
+    for source_key, content in pages.items():
+        for label, parser, restrict in MODES:
+            strainer = PARSE_REGIONS.get(source_key) if restrict else None
+            rows.append({"source": source_key, "mode": label, "bytes": len(content),
+                         **measure(content, parser, strainer, repeat)})
+    return rows
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("pages", nargs="*", help="source_key=path to a saved listing page")
+    arg_parser.add_argument("--repeat", type=int, default=5)
+    arg_parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = arg_parser.parse_args()
+
+    if args.pages:
+        pages = {}
+        for spec in args.pages:
+            source_key, path = spec.split("=", 1)
+            with open(path, "rb") as f:
+                pages[source_key] = f.read()
+    else:
+        pages = {source_key: synthetic_page(source_key) for source_key in PARSE_REGIONS}
+
+    rows = run(pages, args.repeat)
+    if args.json:
+        print(json.dumps(rows, indent=2))
+        return
+
+    print(f"{'source':<20} {'mode':<12} {'bytes':>9} {'parse ms':>10} {'peak MB':>9}")
+    for row in rows:
+        print(f"{row['source']:<20} {row['mode']:<12} {row['bytes']:>9} {row['parse_ms']:>10} {row['peak_mb']:>9}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+"""
+Article detail enrichment
+Listing pages rarely carry an article's date, real author or summary. The
+Enricher fetches each article's own page on a bounded thread pool and reads
+them, plus a word count, from its JSON-LD and meta tags. Details are cached
+by normalized URL, so every article page is fetched once per process; pages
+that fail or miss the deadline are simply tried again by the next scrape.
+"""
+
+import json
+import os
+import re
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, wait
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import soupsieve as sv
+from bs4 import BeautifulSoup
+
+from article_store import PLACEHOLDERS, normalize_url
+from http_client import fetch_page, get_session
+from metrics import ENRICHMENTS
+from parsing import make_soup
+from resilience import SOURCE_DEADLINE, Deadline
+
+# Whether scrapers enrich their articles unless told otherwise
+ENRICH_ARTICLES = os.environ.get("SCRAPE_ENRICH", "0") == "1"
+
+# JSON-LD types that describe the article itself
+ARTICLE_TYPES = frozenset(["Article", "NewsArticle", "BlogPosting", "TechArticle", "Report", "ScholarlyArticle",
+                           "AnalysisNewsArticle", "SocialMediaPosting", "DiscussionForumPosting"])
+
+# Meta tags per field, most specific first (property, name and itemprop share one namespace)
+META_FIELDS = {
+    "date": ["article:published_time", "datepublished", "og:published_time", "citation_publication_date",
+             "dc.date", "date", "pubdate"],
+    "author": ["author", "article:author", "citation_author", "dc.creator", "twitter:creator"],
+    "excerpt": ["og:description", "description", "twitter:description"],
+}
+
+# Element holding the article text, for the word count
+ARTICLE_BODY = sv.compile("[itemprop=articleBody], div.entry-content, div.td-post-content, article, main")
+NON_TEXT_TAGS = ["script", "style", "noscript", "nav", "aside", "footer", "header", "form", "figure"]
+WHITESPACE_RE = re.compile(r'\s+')
+
+
+def _clean(value: Any) -> Optional[str]:
+    if not isinstance(value, str):
+        return None
+    value = WHITESPACE_RE.sub(" ", value).strip()
+    return value or None
+
+
+def _normalize_date(value: Optional[str]) -> Optional[str]:
+    """ISO 8601 date as the scrapers emit it, raw value if unparseable"""
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00")).isoformat()
+    except ValueError:
+        return value
+
+
+def _excerpt(text: Optional[str]) -> Optional[str]:
+    if not text:
+        return None
+    return text[:200] + "..." if len(text) > 200 else text
+
+
+def _json_ld_nodes(soup: BeautifulSoup) -> Iterator[Dict[str, Any]]:
+    """Every object in the page's JSON-LD blocks, @graph members included"""
+    for script in soup.find_all('script', type='application/ld+json'):
+        try:
+            data = json.loads(script.string or "", strict=False)
+        except ValueError:
+            continue
+        pending = data if isinstance(data, list) else [data]
+        while pending:
+            node = pending.pop(0)
+            if isinstance(node, list):
+                pending.extend(node)
+            elif isinstance(node, dict):
+                yield node
+                if isinstance(node.get("@graph"), list):
+                    pending.extend(node["@graph"])
+
+
+def _is_article(node: Dict[str, Any]) -> bool:
+    types = node.get("@type")
+    types = types if isinstance(types, list) else [types]
+    return any(t in ARTICLE_TYPES for t in types)
+
+
+def _author_names(value: Any, nodes_by_id: Dict[str, Dict[str, Any]]) -> List[str]:
+    """Names in a JSON-LD author value: text, Person objects, @id references or a list of them"""
+    if isinstance(value, list):
+        return [name for item in value for name in _author_names(item, nodes_by_id)]
+    if isinstance(value, dict):
+        if "name" not in value and value.get("@id") in nodes_by_id:
+            value = nodes_by_id[value["@id"]]
+        value = value.get("name")
+    name = _clean(value)
+    return [name] if name and not name.startswith("http") else []
+
+
+def _from_json_ld(soup: BeautifulSoup) -> Dict[str, Any]:
+    nodes = list(_json_ld_nodes(soup))
+    article = next((node for node in nodes if _is_article(node)), None)
+    if article is None:
+        return {}
+    nodes_by_id = {node["@id"]: node for node in nodes if isinstance(node.get("@id"), str)}
+    details: Dict[str, Any] = {
+        "date": _normalize_date(_clean(article.get("datePublished")) or _clean(article.get("dateCreated"))),
+        "author": ", ".join(_author_names(article.get("author"), nodes_by_id)) or None,
+        "excerpt": _excerpt(_clean(article.get("description"))),
+    }
+    try:
+        details["word_count"] = int(article["wordCount"])
+    except (KeyError, TypeError, ValueError):
+        pass
+    return {field: value for field, value in details.items() if value}
+
+
+def _from_meta(soup: BeautifulSoup) -> Dict[str, Any]:
+    tags: Dict[str, str] = {}
+    for meta in soup.find_all('meta', content=True):
+        key = meta.get('property') or meta.get('name') or meta.get('itemprop')
+        content = _clean(meta['content'])
+        if key and content:
+            tags.setdefault(key.lower(), content)
+
+    details = {}
+    for field, keys in META_FIELDS.items():
+        values = [tags[key] for key in keys if key in tags]
+        if field == "author":
+            # article:author is often a profile URL and twitter:creator a handle
+            values = [value for value in values if not value.startswith(("http", "@"))]
+        if values:
+            details[field] = values[0]
+    if "date" in details:
+        details["date"] = _normalize_date(details["date"])
+    if "excerpt" in details:
+        details["excerpt"] = _excerpt(details["excerpt"])
+    return details
+
+
+def _word_count(soup: BeautifulSoup) -> Optional[int]:
+    body = ARTICLE_BODY.select_one(soup)
+    if body is None:
+        return None
+    for element in body.find_all(NON_TEXT_TAGS):
+        element.decompose()
+    return len(body.get_text(" ").split()) or None
+
+
+def extract_details(content, parser: Optional[str] = None) -> Dict[str, Any]:
+    """Date, author, excerpt and word count of an article page, whichever can be found.
+
+    JSON-LD is preferred over meta tags; without a wordCount the words of the
+    article body are counted.
+    """
+    soup = make_soup(content, parser=parser)
+    details = {**_from_meta(soup), **_from_json_ld(soup)}
+    if "word_count" not in details:
+        words = _word_count(soup)
+        if words:
+            details["word_count"] = words
+    return details
+
+
+def apply_details(article: Dict[str, Any], details: Dict[str, Any],
+                  default_author: Optional[str] = None) -> Dict[str, Any]:
+    """Copy of article with placeholder fields (and the source's stand-in author) filled from details"""
+    enriched = dict(article)
+    for field in ("author", "date", "excerpt"):
+        current = article.get(field)
+        if details.get(field) and (current in PLACEHOLDERS or (field == "author" and current == default_author)):
+            enriched[field] = details[field]
+    if details.get("word_count"):
+        enriched["word_count"] = details["word_count"]
+    return enriched
+
+
+class DetailCache:
+    """Details of enriched articles by normalized URL, least recently used dropped first"""
+
+    def __init__(self, size: int = 2000):
+        self.size = size
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, url: str) -> Optional[Dict[str, Any]]:
+        key = normalize_url(url)
+        with self._lock:
+            details = self._entries.get(key)
+            if details is not None:
+                self._entries.move_to_end(key)
+            return details
+
+    def put(self, url: str, details: Dict[str, Any]):
+        key = normalize_url(url)
+        with self._lock:
+            self._entries[key] = details
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class Enricher:
+    def __init__(self, workers: int = 4, cache_size: int = 2000, parser: Optional[str] = None):
+        # Article pages fetched at once per enrich call; the per-host rate limiter still paces them
+        self.workers = max(1, workers)
+        self.cache = DetailCache(cache_size)
+        self.parser = parser
+        self.session = get_session()
+
+    @classmethod
+    def from_env(cls) -> "Enricher":
+        """Build an enricher configured by the SCRAPE_ENRICH_* environment variables"""
+        return cls(
+            workers=int(os.environ.get("SCRAPE_ENRICH_WORKERS", 4)),
+            cache_size=int(os.environ.get("SCRAPE_ENRICH_CACHE_SIZE", 2000)),
+        )
+
+    def _details(self, url: str, headers: Dict[str, str], deadline: Deadline) -> Dict[str, Any]:
+        response = fetch_page(self.session, url, Deadline(SOURCE_DEADLINE, parent=deadline), headers=headers)
+        response.raise_for_status()
+        details = extract_details(response.content, self.parser)
+        self.cache.put(url, details)
+        return details
+
+    def enrich(self, articles: List[Dict[str, Any]], deadline: Optional[Deadline] = None,
+               headers: Optional[Dict[str, str]] = None,
+               default_author: Optional[str] = None) -> Tuple[List[Dict[str, Any]], Dict[str, int]]:
+        """Enriched copies of articles and counts of cached, fetched and failed lookups.
+
+        Pages not read before the deadline leave their articles as they were.
+        """
+        deadline = deadline or Deadline(SOURCE_DEADLINE)
+        found: Dict[str, Dict[str, Any]] = {}
+        missing: List[str] = []
+        stats = {"cached": 0, "fetched": 0, "failed": 0}
+        for article in articles:
+            link = article.get("link")
+            if not link or link in found or link in missing:
+                continue
+            details = self.cache.get(link)
+            if details is not None:
+                found[link] = details
+                stats["cached"] += 1
+            else:
+                missing.append(link)
+
+        if missing and not deadline.expired:
+            pool = ThreadPoolExecutor(max_workers=min(self.workers, len(missing)), thread_name_prefix="enrich")
+            try:
+                futures = {pool.submit(self._details, url, headers or {}, deadline): url for url in missing}
+                done, _ = wait(futures, timeout=deadline.remaining())
+                for future in done:
+                    try:
+                        found[futures[future]] = future.result()
+                        stats["fetched"] += 1
+                    except Exception as e:
+                        print(f"⚠️ Could not enrich {futures[future]}: {e}")
+            finally:
+                pool.shutdown(wait=False, cancel_futures=True)
+        stats["failed"] = len(missing) - stats["fetched"]
+
+        for outcome, count in stats.items():
+            if count:
+                ENRICHMENTS.inc(count, outcome=outcome)
+        enriched = [apply_details(article, found[article["link"]], default_author)
+                    if article.get("link") in found else article for article in articles]
+        return enriched, stats
+
+    def enrich_result(self, result: Dict[str, Any], deadline: Optional[Deadline] = None,
+                      headers: Optional[Dict[str, str]] = None,
+                      default_author: Optional[str] = None, field: str = "articles") -> Dict[str, Any]:
+        """Scrape result with its articles (and new_articles) enriched and an "enrichment" summary.
+
+        field names the result's article list; the Alignment Forum scrapers call it "posts".
+        """
+        if not result.get("success"):
+            return result
+        articles = result.get(field, [])
+        new_articles = result.get("new_articles", [])
+        # One pass over both lists, so no page is looked up twice
+        enriched, stats = self.enrich(articles + new_articles, deadline, headers, default_author)
+        result = {**result, field: enriched[:len(articles)], "enrichment": stats}
+        if "new_articles" in result:
+            result["new_articles"] = enriched[len(articles):]
+        return result
+
+
+_enricher: Optional[Enricher] = None
+_enricher_lock = threading.Lock()
+
+
+def get_enricher() -> Enricher:
+    """Return the process-wide enricher (and its detail cache), creating it on first use"""
+    global _enricher
+    if _enricher is None:
+        with _enricher_lock:
+            if _enricher is None:
+                _enricher = Enricher.from_env()
+    return _enricher
@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+"""
+Declarative article extraction
+Each source is described by CSS selector rules that are compiled once at
+import time; a single generic engine applies them to a parsed listing page.
+"""
+
+import json
+import re
+from datetime import datetime
+from itertools import islice
+from typing import Any, Dict, Iterator, List, Optional
+from urllib.parse import urljoin, urlsplit
+
+import soupsieve as sv
+from bs4 import BeautifulSoup, Tag
+
+from incremental import KnownLinks
+
+# Every rule is a list of selectors tried in order until one matches:
+#   container - optional region to search in (error if none match)
+#   items     - article elements within the container
+#   discover  - when no `items` selector matches, look for JSON-LD articles and
+#               headline links instead (see discover_candidates)
+#   title     - title element within an item
+#   link      - anchor within an item
+#   next_page - links to further listing pages, followed by crawls before the
+#               generic rel=next / numbered page links (see pagination_links)
+SELECTORS: Dict[str, Dict[str, Any]] = {
+    "ai_alignment_forum": {
+        "container": ["div.PostsList2-postsBoxShadow", "div[class*=PostsList]"],
+        "items": ["span[class*=post_]", "span[class*=post]"],
+        "discover": False,
+        "title": ["span.PostsTitle-eaTitleDesktopEllipsis", "span[class*=Title]", "a"],
+        "link": ["a"],
+        # Older posts load through a script ("Load More"), so crawls see only the front page
+        "next_page": [],
+        "base_url": "https://www.alignmentforum.org",
+        "author": "Unknown",
+        "min_title_length": 1,
+        "skip_titles": [],
+    },
+    "mit_news": {
+        "container": [],
+        "items": [":is(article, div):is([class*=article], [class*=news], [class*=story])"],
+        "discover": True,
+        "title": ["h3, h2, h1", "a[href]"],
+        "link": ["a[href]"],
+        "next_page": ["li.pager__item--next a[href]"],
+        "base_url": "https://news.mit.edu",
+        "author": "MIT News",
+        "min_title_length": 10,
+        "skip_titles": ["mit news", "artificial intelligence", "topics"],
+    },
+    "towards_ai": {
+        "container": [],
+        "items": [":is(article, div):is([class*=article], [class*=post], [class*=card], [class*=content])"],
+        "discover": True,
+        "title": ["h3, h2, h1", "a[href]"],
+        "link": ["a[href]"],
+        "next_page": ["a.next[href]"],
+        "base_url": "https://towardsai.net",
+        "author": "Towards AI",
+        "min_title_length": 10,
+        "skip_titles": ["towards ai", "artificial intelligence", "latest"],
+    },
+    "marktechpost": {
+        "container": [],
+        "items": [":is(article, div):is([class*=article], [class*=post], [class*=card], [class*=content], [class*=entry])"],
+        "discover": True,
+        "title": ["h1, h2, h3, h4", "a[href]"],
+        "link": ["a[href]"],
+        "next_page": ["div.page-nav a[aria-label=next-page]", "a.next.page-numbers[href]"],
+        "base_url": "https://www.marktechpost.com",
+        "author": "MarkTechPost",
+        "min_title_length": 10,
+        "skip_titles": ["marktechpost", "artificial intelligence", "latest"],
+    },
+}
+
+SELECTOR_RULES = ("container", "items", "title", "link", "next_page")
+
+# Pagination every source may have: rel=next and numbered archive pages
+NEXT_PAGE_PATTERNS = [sv.compile("link[rel=next][href], a[rel=next][href]")]
+PAGE_NUMBER_RE = re.compile(r'/page/\d+/?$|[?&]page=\d+')
+
+HEADING_TAGS = frozenset(["h1", "h2", "h3", "h4"])
+NAVIGATION_TAGS = ["nav", "header", "footer", "aside"]
+JSON_LD_ARTICLE_TYPES = frozenset(["Article", "NewsArticle", "BlogPosting", "TechArticle", "ScholarlyArticle"])
+
+
+def compile_selectors(config: Dict[str, Any]) -> Dict[str, Any]:
+    """Compile the CSS rules of one source config"""
+    compiled = dict(config)
+    for rule in SELECTOR_RULES:
+        compiled[rule] = [sv.compile(css) for css in config.get(rule, [])]
+    compiled["skip_titles"] = frozenset(config.get("skip_titles", []))
+    return compiled
+
+
+COMPILED_SELECTORS: Dict[str, Dict[str, Any]] = {
+    source_key: compile_selectors(config) for source_key, config in SELECTORS.items()
+}
+
+
+def _first(scope: Tag, patterns: List[sv.SoupSieve]) -> Optional[Tag]:
+    """First element matched by the first pattern that matches anything"""
+    for pattern in patterns:
+        element = pattern.select_one(scope)
+        if element is not None:
+            return element
+    return None
+
+
+def _first_nonempty(scope: Tag, patterns: List[sv.SoupSieve]) -> List[Tag]:
+    """All elements of the first pattern that matches anything"""
+    for pattern in patterns:
+        elements = pattern.select(scope)
+        if elements:
+            return elements
+    return []
+
+
+def _json_ld_nodes(data: Any) -> Iterator[Dict[str, Any]]:
+    """Walk a JSON-LD document, descending into @graph and ItemList entries"""
+    if isinstance(data, list):
+        for entry in data:
+            yield from _json_ld_nodes(entry)
+    elif isinstance(data, dict):
+        yield data
+        for key in ("@graph", "itemListElement", "item"):
+            if key in data:
+                yield from _json_ld_nodes(data[key])
+
+
+def structured_candidates(soup: BeautifulSoup, limit: int) -> List[Dict[str, Any]]:
+    """Articles declared as JSON-LD in the document head"""
+    if soup.head is None:
+        return []
+
+    candidates = []
+    for script in soup.head.find_all('script', type='application/ld+json'):
+        try:
+            data = json.loads(script.string or "")
+        except ValueError:
+            continue
+        for node in _json_ld_nodes(data):
+            node_type = node.get("@type")
+            types = node_type if isinstance(node_type, list) else [node_type]
+            title = node.get("headline") or node.get("name")
+            link = node.get("url")
+            if not title or not link or not JSON_LD_ARTICLE_TYPES.intersection(types):
+                continue
+            author = node.get("author")
+            if isinstance(author, list):
+                author = author[0] if author else None
+            if isinstance(author, dict):
+                author = author.get("name")
+            candidates.append({"title": title, "link": link, "author": author, "date": node.get("datePublished")})
+            if len(candidates) >= limit:
+                return candidates
+    return candidates
+
+
+def iter_candidates(scope: Tag, min_title_length: int = 10,
+                    skip_titles: frozenset = frozenset()) -> Iterator[Dict[str, Any]]:
+    """Headline links in document order, found lazily while walking the tree once.
+
+    A candidate is an h1-h4 whose text is mostly link text (link density of
+    at least one half) and that is not inside navigation chrome. Each hit
+    carries the heading's parent as `block` for callers that read more fields.
+    """
+    seen_links = set()
+
+    for element in scope.descendants:
+        if not isinstance(element, Tag) or element.name not in HEADING_TAGS:
+            continue
+
+        link_element = element.find('a', href=True) or element.find_parent('a', href=True)
+        if link_element is None or element.find_parent(NAVIGATION_TAGS) is not None:
+            continue
+
+        title = element.get_text(strip=True)
+        link = link_element.get('href')
+        if len(title) < min_title_length or title.lower() in skip_titles or link in seen_links:
+            continue
+        if len(link_element.get_text(strip=True)) * 2 < len(title):
+            continue
+
+        seen_links.add(link)
+        yield {"title": title, "link": link, "block": element.parent}
+
+
+def discover_candidates(scope: Tag, limit: int, min_title_length: int = 10,
+                        skip_titles: frozenset = frozenset()) -> List[Dict[str, Any]]:
+    """The first `limit` headline links of iter_candidates"""
+    return list(islice(iter_candidates(scope, min_title_length, skip_titles), limit))
+
+
+def discover_blocks(scope: Tag, limit: int) -> List[Tag]:
+    """Distinct blocks holding discovered headline links, for the standalone scrapers' fallback"""
+    blocks = []
+    for candidate in discover_candidates(scope, limit):
+        if not any(block is candidate["block"] for block in blocks):
+            blocks.append(candidate["block"])
+    return blocks
+
+
+def _item_candidates(items: List[Tag], config: Dict[str, Any], limit: int) -> Iterator[Dict[str, Any]]:
+    """Title and link of each selected item, skipping ones that fail the title filters"""
+    for item in items[:limit]:
+        try:
+            title_element = _first(item, config["title"])
+            if title_element is None:
+                continue
+
+            title = title_element.get_text(strip=True)
+            if len(title) < config["min_title_length"] or title.lower() in config["skip_titles"]:
+                continue
+
+            link_element = _first(item, config["link"])
+            yield {"title": title, "link": link_element.get('href') if link_element else None}
+
+        except Exception:
+            continue
+
+
+def extract_articles(soup: BeautifulSoup, source_key: str, source: Dict, limit: int = 10,
+                     known: Optional[KnownLinks] = None) -> Dict[str, Any]:
+    """Extract up to `limit` articles from a listing page using the source's selectors.
+
+    With `known`, articles seen by the previous scrape are skipped and
+    extraction stops once `known` says the rest of the page is old.
+    """
+    config = COMPILED_SELECTORS[source_key]
+
+    scope = soup
+    if config["container"]:
+        scope = _first(soup, config["container"])
+        if scope is None:
+            return {"error": "Posts container not found"}
+
+    items = _first_nonempty(scope, config["items"])
+    if items:
+        candidates = _item_candidates(items, config, limit)
+    elif config["discover"]:
+        # Discovery is lazy so an incremental scrape stops walking the tree at known links
+        candidates = structured_candidates(soup, limit) or iter_candidates(
+            scope, config["min_title_length"], config["skip_titles"])
+    else:
+        candidates = []
+
+    news_items = []
+
+    for candidate in candidates:
+        if len(news_items) >= limit:
+            break
+        link = candidate["link"]
+        if link and not link.startswith('http'):
+            link = config["base_url"] + link
+        if known is not None and known.seen(link):
+            if known.done:
+                break
+            continue
+
+        news_items.append({
+            "title": candidate["title"],
+            "author": candidate.get("author") or config["author"],
+            "date": candidate.get("date") or "Unknown",
+            "excerpt": "",
+            "link": link,
+            "source": source['name'],
+            "scraped_at": datetime.now().isoformat()
+        })
+
+    return {
+        "success": True,
+        "source": source['url'],
+        "source_name": source['name'],
+        "total_articles": len(news_items),
+        "articles": news_items,
+        "scraped_at": datetime.now().isoformat()
+    }
+
+
+def pagination_links(soup: BeautifulSoup, source_key: str, page_url: str) -> List[str]:
+    """Absolute same-host URLs of further listing pages linked from a page, best guesses first"""
+    config = COMPILED_SELECTORS[source_key]
+    host = urlsplit(page_url).netloc
+    elements = [element for pattern in config["next_page"] + NEXT_PAGE_PATTERNS for element in pattern.select(soup)]
+    elements += soup.find_all('a', href=PAGE_NUMBER_RE)
+
+    links = []
+    for element in elements:
+        link = urljoin(page_url, element.get('href', '')).split('#', 1)[0]
+        if urlsplit(link).netloc == host and link != page_url and link not in links:
+            links.append(link)
+    return links
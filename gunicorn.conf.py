@@ -0,0 +1,24 @@
+"""
+Gunicorn settings for the production server (./start_server.sh prod)
+Every value can be overridden through the environment.
+"""
+
+import os
+
+bind = os.environ.get("BIND", "0.0.0.0:5001")
+workers = int(os.environ.get("WEB_WORKERS", 2))
+# gthread workers keep SSE streams and slow fallback scrapes from blocking other requests
+worker_class = "gthread"
+threads = int(os.environ.get("WEB_THREADS", 8))
+timeout = int(os.environ.get("WEB_TIMEOUT", 60))
+graceful_timeout = int(os.environ.get("WEB_GRACEFUL_TIMEOUT", 30))
+keepalive = 5
+# Each worker must open its own SQLite connections and scheduler threads after fork
+preload_app = False
+accesslog = "-"
+
+
+def worker_exit(server, worker):
+    """Stop scheduled scrapes and release the leader lock on graceful shutdown"""
+    from app import stop_background_scraping
+    stop_background_scraping()
@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+Shared HTTP layer for all scrapers
+Provides one pooled requests.Session per process so repeated scrapes reuse
+keep-alive connections instead of paying a TCP/TLS handshake every time, and
+the equivalent aiohttp session for scrapes running on an event loop.
+"""
+
+import asyncio
+import os
+import threading
+import weakref
+from contextlib import ExitStack, asynccontextmanager
+from typing import Any, Dict, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from rate_limit import RateLimited, RateLimiter, get_rate_limiter
+from resilience import Deadline
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+# Exceptions that mean an async fetch failed (requests.RequestException equivalent)
+ASYNC_REQUEST_ERRORS = ((aiohttp.ClientError, asyncio.TimeoutError, RateLimited) if aiohttp
+                        else (asyncio.TimeoutError, RateLimited))
+
+# Connecting should be quick; the read timeout bounds each wait for more bytes,
+# and a Deadline bounds the whole download
+CONNECT_TIMEOUT = float(os.environ.get("HTTP_CONNECT_TIMEOUT", 5))
+READ_TIMEOUT = float(os.environ.get("HTTP_READ_TIMEOUT", 15))
+READ_CHUNK_SIZE = 64 * 1024
+
+USER_AGENT = 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+
+
+def _accept_encoding() -> str:
+    """Advertise brotli only when a decoder is installed for urllib3"""
+    try:
+        import brotli  # noqa: F401
+        return "gzip, deflate, br"
+    except ImportError:
+        return "gzip, deflate"
+
+
+class RateLimitedAdapter(HTTPAdapter):
+    """HTTPAdapter that sends every request through a per-host RateLimiter slot"""
+
+    def __init__(self, limiter: RateLimiter, **kwargs):
+        self.limiter = limiter
+        super().__init__(**kwargs)
+
+    def send(self, request, stream=False, **kwargs):
+        slot = ExitStack()
+        slot.enter_context(self.limiter.slot(request.url))
+        try:
+            response = super().send(request, stream=stream, **kwargs)
+            if not stream:
+                # Download the body while the slot is held so it counts as in flight
+                response.content
+        except BaseException:
+            slot.close()
+            raise
+        if stream:
+            self._hold_until_released(response, slot)
+        else:
+            slot.close()
+        self.limiter.observe(request.url, response.status_code, response.headers)
+        return response
+
+    @staticmethod
+    def _hold_until_released(response: requests.Response, slot: ExitStack):
+        """Keep a streamed response's slot until its connection goes back to the pool.
+
+        urllib3 releases the connection once the body is read to the end, and
+        Response.close() releases it too, so every way of finishing a download
+        frees the slot; the finalizer covers responses dropped unread.
+        """
+        raw = response.raw
+        release_conn = raw.release_conn
+
+        def release():
+            slot.close()
+            release_conn()
+
+        raw.release_conn = release
+        weakref.finalize(response, slot.close)
+
+
+def create_session(pool_connections: Optional[int] = None, pool_maxsize: Optional[int] = None,
+                   limiter: Optional[RateLimiter] = None) -> requests.Session:
+    """Build a session with per-host connection pools, rate limiting and compression negotiation"""
+    pool_connections = pool_connections or int(os.environ.get("HTTP_POOL_CONNECTIONS", 10))
+    pool_maxsize = pool_maxsize or int(os.environ.get("HTTP_POOL_MAXSIZE", 10))
+
+    session = requests.Session()
+    # pool_connections = number of hosts kept, pool_maxsize = connections kept per host;
+    # pool_block stops bursts from opening connections beyond that limit
+    adapter = RateLimitedAdapter(limiter or get_rate_limiter(), pool_connections=pool_connections,
+                                 pool_maxsize=pool_maxsize, pool_block=True)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update({
+        "User-Agent": USER_AGENT,
+        "Accept-Encoding": _accept_encoding(),
+        "Connection": "keep-alive",
+    })
+    return session
+
+
+def request_timeout(deadline: Optional[Deadline] = None) -> Tuple[float, float]:
+    """(connect, read) timeout for requests, never longer than what is left of deadline"""
+    remaining = deadline.remaining() if deadline else None
+    if remaining is None:
+        return CONNECT_TIMEOUT, READ_TIMEOUT
+    remaining = max(remaining, 0.001)
+    return min(CONNECT_TIMEOUT, remaining), min(READ_TIMEOUT, remaining)
+
+
+def async_timeout(deadline: Optional[Deadline] = None) -> "aiohttp.ClientTimeout":
+    """aiohttp equivalent of request_timeout; the deadline bounds the whole request"""
+    remaining = deadline.remaining() if deadline else None
+    return aiohttp.ClientTimeout(total=max(remaining, 0.001) if remaining is not None else None,
+                                 connect=CONNECT_TIMEOUT, sock_read=READ_TIMEOUT)
+
+
+class DeadlineStream:
+    """File-like view of a streamed response body that raises DeadlineExceeded
+    between reads once the deadline passes, so a server trickling bytes slower
+    than the read timeout cannot hold a scrape open indefinitely"""
+
+    def __init__(self, raw, deadline: Optional[Deadline], what: str = "Download"):
+        raw.decode_content = True
+        # read1 returns after one socket read instead of waiting for a full chunk
+        self._read = getattr(raw, "read1", raw.read)
+        self.deadline = deadline
+        self.what = what
+        # Decoded bytes handed out so far
+        self.bytes_read = 0
+
+    def read(self, amt: int = READ_CHUNK_SIZE) -> bytes:
+        if self.deadline is not None:
+            self.deadline.check(self.what)
+        chunk = self._read(amt)
+        self.bytes_read += len(chunk)
+        return chunk
+
+
+def fetch_page(session: requests.Session, url: str, deadline: Optional[Deadline] = None, **kwargs) -> requests.Response:
+    """session.get with separate connect/read timeouts and the body read under deadline"""
+    response = session.get(url, timeout=request_timeout(deadline), stream=True, **kwargs)
+    try:
+        stream = DeadlineStream(response.raw, deadline, f"Download of {url}")
+        chunks = []
+        while True:
+            chunk = stream.read()
+            if not chunk:
+                break
+            chunks.append(chunk)
+    except BaseException:
+        response.close()
+        raise
+    # Hand back an ordinary, fully read Response (what requests does for stream=False)
+    response._content = b"".join(chunks)
+    response._content_consumed = True
+    response.raw.release_conn()
+    return response
+
+
+def create_async_session(pool_maxsize: Optional[int] = None) -> "aiohttp.ClientSession":
+    """aiohttp counterpart of create_session; must be created and closed on the loop that uses it"""
+    if aiohttp is None:
+        raise RuntimeError("Async scraping needs aiohttp (pip install aiohttp)")
+    pool_maxsize = pool_maxsize or int(os.environ.get("HTTP_POOL_MAXSIZE", 10))
+    return aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(limit_per_host=pool_maxsize),
+        timeout=async_timeout(),
+        headers={"User-Agent": USER_AGENT, "Accept-Encoding": _accept_encoding()},
+    )
+
+
+@asynccontextmanager
+async def limited_get(session: "aiohttp.ClientSession", url: str, limiter: Optional[RateLimiter] = None, **kwargs):
+    """session.get(url) inside a per-host RateLimiter slot, held until the body is read"""
+    limiter = limiter or get_rate_limiter()
+    async with limiter.slot_async(url):
+        async with session.get(url, **kwargs) as response:
+            limiter.observe(url, response.status, response.headers)
+            yield response
+
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+
+def get_session() -> requests.Session:
+    """Return the process-wide shared session, creating it on first use"""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = create_session()
+    return _session
+
+
+class ConditionalCache:
+    """Remembers ETag / Last-Modified per URL together with the parsed result,
+    so an unchanged page (304) can be answered without downloading or parsing it"""
+
+    def __init__(self):
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def request_headers(self, url: str) -> Dict[str, str]:
+        """Conditional request headers for url, empty if nothing is cached"""
+        with self._lock:
+            entry = self._entries.get(url)
+        if not entry:
+            return {}
+        headers = {}
+        if entry["etag"]:
+            headers["If-None-Match"] = entry["etag"]
+        if entry["last_modified"]:
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def store(self, url: str, response, payload: Dict[str, Any]):
+        """Keep payload for url if the response (requests or aiohttp) carried validators"""
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        with self._lock:
+            if etag or last_modified:
+                self._entries[url] = {"etag": etag, "last_modified": last_modified, "payload": payload}
+            else:
+                self._entries.pop(url, None)
+
+    def payload(self, url: str) -> Optional[Dict[str, Any]]:
+        """Previously parsed result for url"""
+        with self._lock:
+            entry = self._entries.get(url)
+        return entry["payload"] if entry else None
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Incremental scraping
+SeenArticles remembers the articles each source returned last time. For the
+next scrape it hands out a KnownLinks stop condition: listing pages and
+feeds run newest first, so once extraction meets a few already-seen links in
+a row everything further down has been seen too, and it stops there. Only
+the new articles (the delta) need to be stored.
+"""
+
+import os
+import threading
+from typing import Any, Dict, FrozenSet, List, Optional
+
+from article_store import normalize_url
+
+# Consecutive known links that end an extraction; more than one so a pinned
+# or featured post at the top of a listing does not hide the new ones below it
+KNOWN_RUN = int(os.environ.get("SCRAPE_INCREMENTAL_KNOWN_RUN", 2))
+
+# Fields of a scraped article (store rows carry extra bookkeeping columns)
+ARTICLE_FIELDS = ("title", "author", "date", "excerpt", "link", "source", "scraped_at")
+
+
+class KnownLinks:
+    """Stop condition for one extraction over links seen by the previous scrape"""
+
+    def __init__(self, links: FrozenSet[str], run: int = KNOWN_RUN):
+        self.links = links
+        self.run = max(1, run)
+        # Known links met so far, and how many of them in a row
+        self.hits = 0
+        self._streak = 0
+
+    def seen(self, link: Optional[str]) -> bool:
+        """Whether link was seen before; consecutive hits count towards done"""
+        if link and normalize_url(link) in self.links:
+            self.hits += 1
+            self._streak += 1
+            return True
+        self._streak = 0
+        return False
+
+    @property
+    def done(self) -> bool:
+        return self._streak >= self.run
+
+
+class SeenArticles:
+    def __init__(self, size: int = 10):
+        # Newest articles kept per source; their links make up the stop condition
+        self.size = size
+        self._articles: Dict[str, List[Dict[str, Any]]] = {}
+        self._lock = threading.Lock()
+
+    def known(self, source_key: str) -> Optional[KnownLinks]:
+        """Stop condition for the next scrape of a source, None until it has been scraped once"""
+        with self._lock:
+            articles = self._articles.get(source_key)
+        if not articles:
+            return None
+        return KnownLinks(frozenset(normalize_url(a["link"]) for a in articles if a.get("link")))
+
+    def remember(self, source_key: str, articles: List[Dict[str, Any]]):
+        """Take articles (newest first) as the source's latest known state"""
+        with self._lock:
+            self._articles[source_key] = [{field: a.get(field) for field in ARTICLE_FIELDS}
+                                          for a in articles[:self.size]]
+
+    def merge(self, source_key: str, new_articles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """New articles followed by the previously known ones, remembered as the new state"""
+        new_links = {normalize_url(a["link"]) for a in new_articles if a.get("link")}
+        with self._lock:
+            previous = [a for a in self._articles.get(source_key, [])
+                        if not a.get("link") or normalize_url(a["link"]) not in new_links]
+        merged = (new_articles + previous)[:self.size]
+        self.remember(source_key, merged)
+        return merged
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+In-process metrics in the Prometheus text format
+Counters and histograms for the scrape hot path (fetch, parse and extract
+time, bytes, articles and outcomes per source) and for API request latency,
+plus gauges read from live objects when /api/metrics is scraped. Values are
+per process.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Sequence, Tuple
+
+LabelValues = Tuple[str, ...]
+
+# Prometheus client defaults, stretched to cover slow upstream sites
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: LabelValues, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> LabelValues:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, help, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self) -> List[str]:
+        with self._lock:
+            return [f"{self.name}{_labels(self.labelnames, key)} {_number(value)}"
+                    for key, value in sorted(self._values.items())]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # label values -> [per-bucket counts..., sum, count]
+        self._values: Dict[LabelValues, List[float]] = {}
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            series = self._values.get(key)
+            if series is None:
+                series = self._values[key] = [0] * (len(self.buckets) + 2)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        """Observe the duration of the with-block"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def render(self) -> List[str]:
+        lines = []
+        with self._lock:
+            for key, series in sorted(self._values.items()):
+                for bound, count in zip(self.buckets, series):
+                    le = 'le="%s"' % _number(bound)
+                    lines.append(f"{self.name}_bucket{_labels(self.labelnames, key, le)} {_number(count)}")
+                inf = _labels(self.labelnames, key, 'le="+Inf"')
+                lines.append(f"{self.name}_bucket{inf} {_number(series[-1])}")
+                lines.append(f"{self.name}_sum{_labels(self.labelnames, key)} {_number(round(series[-2], 6))}")
+                lines.append(f"{self.name}_count{_labels(self.labelnames, key)} {_number(series[-1])}")
+        return lines
+
+
+class Gauge(_Metric):
+    """Value read from a callback at render time: {label values: value}.
+    kind="counter" exposes a running total kept elsewhere (e.g. limiter stats)"""
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str],
+                 collect: Callable[[], Dict[LabelValues, float]], kind: str = "gauge"):
+        super().__init__(name, help, labelnames)
+        self.collect = collect
+        self.kind = kind
+
+    def render(self) -> List[str]:
+        return [f"{self.name}{_labels(self.labelnames, key)} {_number(value)}"
+                for key, value in sorted(self.collect().items())]
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+
+    def _register(self, metric: _Metric) -> _Metric:
+        # Registering the same name again returns the existing metric (module reloads)
+        return self._metrics.setdefault(metric.name, metric)
+
+    def counter(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, help, labelnames))
+
+    def histogram(self, name: str, help: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, help, labelnames, buckets))
+
+    def gauge(self, name: str, help: str, labelnames: Sequence[str],
+              collect: Callable[[], Dict[LabelValues, float]], kind: str = "gauge") -> Gauge:
+        return self._register(Gauge(name, help, labelnames, collect, kind))
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format"""
+        lines: List[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.header())
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+# Scrape hot path, per source
+SCRAPE_SECONDS = REGISTRY.histogram(
+    "scrape_duration_seconds", "Total time of one source scrape", ["source"])
+FETCH_SECONDS = REGISTRY.histogram(
+    "scrape_fetch_seconds", "Time to download a listing page or feed (sync feeds: until the headers arrive)",
+    ["source", "via"])
+PARSE_SECONDS = REGISTRY.histogram(
+    "scrape_parse_seconds", "Time to build the parse tree (sync feeds: the body streams into the parser)",
+    ["source", "via"])
+EXTRACT_SECONDS = REGISTRY.histogram(
+    "scrape_extract_seconds", "Time to extract articles from a parsed listing page", ["source"])
+RESPONSE_BYTES = REGISTRY.counter(
+    "scrape_response_bytes_total", "Decoded bytes of listing pages and feeds downloaded", ["source", "via"])
+ARTICLES = REGISTRY.counter(
+    "scrape_articles_total", "Articles returned by scrapes", ["source"])
+SCRAPES = REGISTRY.counter(
+    "scrape_total", "Source scrapes by outcome (success, not_modified, error, request_error, timeout, circuit_open)",
+    ["source", "outcome"])
+ENRICHMENTS = REGISTRY.counter(
+    "article_enrichment_total", "Article page lookups for details by outcome (cached, fetched, failed)", ["outcome"])
+
+# API
+REQUEST_SECONDS = REGISTRY.histogram(
+    "http_request_duration_seconds", "Request latency until the response is ready", ["route", "method", "status"])
+
+
+def scrape_outcome(result: Dict, request_failed: bool = False) -> str:
+    """Outcome label of a source result"""
+    if result.get("success"):
+        return "not_modified" if result.get("not_modified") else "success"
+    if result.get("timed_out"):
+        return "timeout"
+    if result.get("circuit_open"):
+        return "circuit_open"
+    return "request_error" if request_failed else "error"
+
+
+def record_scrape(source_key: str, result: Dict, seconds: float, request_failed: bool = False):
+    """Count one finished source scrape"""
+    SCRAPE_SECONDS.observe(seconds, source=source_key)
+    SCRAPES.inc(source=source_key, outcome=scrape_outcome(result, request_failed))
+    if result.get("success"):
+        ARTICLES.inc(result.get("total_articles", 0), source=source_key)
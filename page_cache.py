@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+In-memory cache for the HTML pages
+Each page is read and rendered once, fingerprinted by a content hash, and only
+re-read when its mtime changes while reloading is enabled (development).
+"""
+
+import hashlib
+import os
+import threading
+from typing import Any, Callable, Dict
+
+
+class PageCache:
+    def __init__(self, root: str, render: Callable[[str], str], reload: bool = False):
+        self.root = root
+        self.render = render
+        self.reload = reload
+        self._pages: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, filename: str) -> Dict[str, Any]:
+        """Rendered page with its body, fingerprint and mtime"""
+        page = self._pages.get(filename)
+        if page is not None and not self.reload:
+            return page
+
+        path = os.path.join(self.root, filename)
+        mtime = os.stat(path).st_mtime
+        if page is not None and page["mtime"] == mtime:
+            return page
+
+        with self._lock:
+            page = self._pages.get(filename)
+            if page is None or page["mtime"] != mtime:
+                with open(path, encoding='utf-8') as f:
+                    body = self.render(f.read()).encode('utf-8')
+                page = {
+                    "body": body,
+                    "fingerprint": hashlib.sha256(body).hexdigest()[:16],
+                    "mtime": mtime,
+                }
+                self._pages[filename] = page
+        return page
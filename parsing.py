@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+HTML parsing helpers shared by all scrapers
+Parses with lxml by default (falling back to html.parser when lxml is not
+installed) and can restrict tree building to the region a scraper reads.
+"""
+
+import os
+import re
+from typing import Dict, Optional
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+
+def _default_parser() -> str:
+    parser = os.environ.get("SCRAPE_HTML_PARSER", "lxml")
+    if parser == "lxml":
+        try:
+            import lxml  # noqa: F401
+        except ImportError:
+            return "html.parser"
+    return parser
+
+
+DEFAULT_PARSER = _default_parser()
+
+# Post-list region of each source; everything outside it is skipped while parsing
+PARSE_REGIONS: Dict[str, SoupStrainer] = {
+    "ai_alignment_forum": SoupStrainer('div', class_=re.compile(r'PostsList')),
+    "mit_news": SoupStrainer(['article', 'div'], class_=re.compile(r'article|news|story')),
+    "towards_ai": SoupStrainer(['article', 'div'], class_=re.compile(r'article|post|card|content')),
+    "marktechpost": SoupStrainer(['article', 'div'], class_=re.compile(r'article|post|card|content|entry')),
+}
+
+
+def make_soup(content, parser: Optional[str] = None, region: Optional[str] = None) -> BeautifulSoup:
+    """Parse content, building only the named source region when one is given.
+
+    If the region matches nothing the full document is parsed instead, so the
+    scrapers' whole-page fallbacks still have something to search.
+    """
+    parser = parser or DEFAULT_PARSER
+    strainer = PARSE_REGIONS.get(region) if region else None
+    if strainer is not None:
+        soup = BeautifulSoup(content, parser, parse_only=strainer)
+        if soup.find() is not None:
+            return soup
+    return BeautifulSoup(content, parser)
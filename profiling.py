@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Per-source CPU and allocation profiles of scrape runs
+ScrapeProfiler runs each source's scrape under cProfile and tracemalloc and
+writes, per source, into one directory per run:
+
+- <source>.pstats            cProfile stats (python -m pstats, snakeviz)
+- <source>.collapsed         CPU time as collapsed stacks in microseconds
+                             (flamegraph.pl, speedscope, inferno)
+- <source>.alloc.collapsed   bytes still allocated at the end of the scrape,
+                             by allocation stack
+- summary.json               wall time, peak memory and top functions per source
+
+cProfile records caller -> callee edges rather than whole stacks, so the CPU
+flamegraph splits each function's time across its callers in proportion to
+their calls; treat it as a map of where time goes, not an exact trace.
+Profiling adds a lot of overhead and only sees the thread it runs in, so
+sources are scraped one after another while it is on.
+"""
+
+import cProfile
+import json
+import os
+import pstats
+import threading
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+# Where profile runs are written unless a directory is given
+PROFILE_DIR = os.environ.get("SCRAPE_PROFILE_DIR", "profiles")
+
+# Frames kept per allocation traceback; deeper stacks make tracing slower
+ALLOC_FRAMES = 32
+
+# Deepest CPU stack written to the collapsed file
+MAX_DEPTH = 80
+
+FuncKey = Tuple[str, int, str]
+
+# Only one profile may run at a time: cProfile and tracemalloc are process-wide
+_profile_lock = threading.Lock()
+
+
+def _label(func: FuncKey) -> str:
+    filename, lineno, name = func
+    label = name if filename == "~" else f"{name} ({os.path.basename(filename)}:{lineno})"
+    # ';' separates frames in the collapsed format
+    return label.replace(";", ",")
+
+
+def collapse_cpu(stats: pstats.Stats) -> List[str]:
+    """Approximate collapsed stacks ("a;b;c <microseconds>") from a cProfile call graph"""
+    raw = stats.stats
+    callees: Dict[FuncKey, Dict[FuncKey, Tuple[float, float]]] = {}
+    for func, (_, _, _, _, callers) in raw.items():
+        for caller, (_, _, tt, ct) in callers.items():
+            callees.setdefault(caller, {})[func] = (tt, ct)
+    roots = [func for func, (_, _, _, _, callers) in raw.items() if not callers]
+
+    weights: Dict[str, float] = {}
+
+    def walk(func: FuncKey, stack: List[str], on_stack: set, tt: float, ct: float):
+        # Paths through a call graph multiply quickly; drop those below a microsecond
+        if ct < 1e-6:
+            return
+        path = stack + [_label(func)]
+        key = ";".join(path)
+        weights[key] = weights.get(key, 0.0) + tt
+        children = callees.get(func, {})
+        if not children or len(path) >= MAX_DEPTH:
+            return
+        # Share this path's time among the callees by their part of the function's total
+        total_ct = raw[func][3] or 1e-12
+        scale = ct / total_ct
+        for child, (child_tt, child_ct) in children.items():
+            if child in on_stack:
+                continue
+            walk(child, path, on_stack | {child}, child_tt * scale, child_ct * scale)
+
+    for root in roots:
+        walk(root, [], {root}, raw[root][2], raw[root][3])
+
+    return [f"{stack} {round(seconds * 1e6)}" for stack, seconds in sorted(weights.items())
+            if round(seconds * 1e6) > 0]
+
+
+def collapse_allocations(snapshot: tracemalloc.Snapshot) -> List[str]:
+    """Collapsed stacks ("a;b;c <bytes>") of the memory still allocated in a snapshot"""
+    lines = []
+    for stat in snapshot.statistics("traceback"):
+        # Frames run from the oldest call to the allocation site; start below the profiler
+        frames = list(stat.traceback)
+        entry = max((i for i, frame in enumerate(frames) if frame.filename == cProfile.__file__), default=-1)
+        stack = ";".join(f"{os.path.basename(frame.filename)}:{frame.lineno}" for frame in frames[entry + 1:])
+        if stack:
+            lines.append(f"{stack} {stat.size}")
+    return lines
+
+
+def top_functions(stats: pstats.Stats, limit: int = 15) -> List[Dict[str, Any]]:
+    """Functions with the most time spent in them (excluding callees)"""
+    rows = sorted(stats.stats.items(), key=lambda item: item[1][2], reverse=True)[:limit]
+    return [{"function": _label(func), "calls": nc, "self_seconds": round(tt, 4), "cumulative_seconds": round(ct, 4)}
+            for func, (_, nc, tt, ct, _) in rows]
+
+
+class ScrapeProfiler:
+    def __init__(self, output_dir: Optional[str] = None):
+        base = output_dir or PROFILE_DIR
+        self.run_dir = os.path.join(base, datetime.now().strftime("%Y%m%d-%H%M%S-%f"))
+        self.sources: Dict[str, Dict[str, Any]] = {}
+
+    def run(self, name: str, func: Callable[[], T]) -> T:
+        """Call func under cProfile and tracemalloc and write its profiles as <name>.*"""
+        os.makedirs(self.run_dir, exist_ok=True)
+        with _profile_lock:
+            was_tracing = tracemalloc.is_tracing()
+            if not was_tracing:
+                tracemalloc.start(ALLOC_FRAMES)
+            tracemalloc.reset_peak()
+            baseline, _ = tracemalloc.get_traced_memory()
+            profile = cProfile.Profile()
+            start = time.perf_counter()
+            try:
+                result = profile.runcall(func)
+            finally:
+                wall = time.perf_counter() - start
+                current, peak = tracemalloc.get_traced_memory()
+                snapshot = tracemalloc.take_snapshot().filter_traces([
+                    tracemalloc.Filter(False, tracemalloc.__file__),
+                    tracemalloc.Filter(False, cProfile.__file__),
+                ])
+                if not was_tracing:
+                    tracemalloc.stop()
+                self._write(name, profile, snapshot, wall, peak - baseline, current - baseline)
+        return result
+
+    def _write(self, name: str, profile: cProfile.Profile, snapshot: tracemalloc.Snapshot,
+               wall: float, peak: int, retained: int):
+        stats = pstats.Stats(profile)
+        files = {
+            "pstats": os.path.join(self.run_dir, f"{name}.pstats"),
+            "cpu_collapsed": os.path.join(self.run_dir, f"{name}.collapsed"),
+            "alloc_collapsed": os.path.join(self.run_dir, f"{name}.alloc.collapsed"),
+        }
+        stats.dump_stats(files["pstats"])
+        with open(files["cpu_collapsed"], "w", encoding="utf-8") as f:
+            f.write("\n".join(collapse_cpu(stats)) + "\n")
+        with open(files["alloc_collapsed"], "w", encoding="utf-8") as f:
+            f.write("\n".join(collapse_allocations(snapshot)) + "\n")
+
+        self.sources[name] = {
+            "wall_seconds": round(wall, 4),
+            "cpu_seconds": round(stats.total_tt, 4),
+            "peak_memory_bytes": max(0, peak),
+            "retained_memory_bytes": max(0, retained),
+            "top_functions": top_functions(stats),
+            "files": files,
+        }
+        with open(os.path.join(self.run_dir, "summary.json"), "w", encoding="utf-8") as f:
+            json.dump(self.summary(), f, indent=2)
+        print(f"🔬 Profiled {name}: {wall:.2f}s wall, peak {peak / 1024 / 1024:.1f} MB -> {files['pstats']}")
+
+    def summary(self) -> Dict[str, Any]:
+        return {"directory": self.run_dir, "sources": self.sources}
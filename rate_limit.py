@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Per-host outbound rate limiting
+Every request to an upstream site first takes one of the host's in-flight
+slots, then a token from the host's token bucket. A 429 (or 503 with
+Retry-After) blocks the host until the server says it may be asked again.
+All scrapers share one limiter per process through http_client.
+"""
+
+import asyncio
+import os
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Mapping, Optional
+from urllib.parse import urlsplit
+
+import requests
+
+# Back-off applied after a 429 that carries no usable Retry-After
+DEFAULT_RETRY_AFTER = 30
+
+
+class RateLimited(requests.RequestException):
+    """Raised instead of waiting longer than the limiter's max_wait for a host"""
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP date)"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class _Host:
+    def __init__(self, name: str, burst: float):
+        self.name = name
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.in_flight = 0
+        self.queued = 0
+        self.requests = 0
+        self.throttled = 0
+        self.rejected = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+
+class RateLimiter:
+    def __init__(self, rate: float = 1.0, burst: float = 5, max_in_flight: int = 2, max_wait: float = 30):
+        # rate: requests per second per host (0 = unlimited); burst: bucket size;
+        # max_in_flight: concurrent requests per host (0 = unlimited)
+        self.rate = rate
+        self.burst = max(1.0, burst)
+        self.max_in_flight = max_in_flight
+        self.max_wait = max_wait
+        self._hosts: Dict[str, _Host] = {}
+        self._lock = threading.Lock()
+        self._slot_freed = threading.Condition(self._lock)
+
+    @classmethod
+    def from_env(cls) -> "RateLimiter":
+        """Build a limiter configured by the SCRAPE_RATE_* environment variables"""
+        return cls(
+            rate=float(os.environ.get("SCRAPE_RATE_PER_HOST", 1.0)),
+            burst=float(os.environ.get("SCRAPE_RATE_BURST", 5)),
+            max_in_flight=int(os.environ.get("SCRAPE_MAX_IN_FLIGHT_PER_HOST", 2)),
+            max_wait=float(os.environ.get("SCRAPE_RATE_MAX_WAIT", 30)),
+        )
+
+    def _host(self, url: str) -> _Host:
+        name = urlsplit(url).netloc.lower()
+        host = self._hosts.get(name)
+        if host is None:
+            host = self._hosts[name] = _Host(name, self.burst)
+        return host
+
+    def _has_slot(self, host: _Host) -> bool:
+        return not self.max_in_flight or host.in_flight < self.max_in_flight
+
+    def _reserve(self, host: _Host, waited: float) -> float:
+        """Take the host's next token (lock held) and return how long to sleep for it.
+
+        Tokens may go negative: each caller reserves the next free moment, so
+        waiters are released in arrival order at exactly `rate` per second.
+        """
+        now = time.monotonic()
+        delay = max(0.0, host.blocked_until - now)
+        if self.rate:
+            host.tokens = min(self.burst, host.tokens + (now - host.updated) * self.rate)
+            host.updated = now
+            delay = max(delay, -(host.tokens - 1) / self.rate if host.tokens < 1 else 0.0)
+        if self.max_wait and waited + delay > self.max_wait:
+            host.rejected += 1
+            raise RateLimited(f"Rate limit for {host.name} would delay the request by {delay:.0f}s")
+        if self.rate:
+            host.tokens -= 1
+        host.in_flight += 1
+        host.requests += 1
+        host.wait_total += waited + delay
+        host.wait_max = max(host.wait_max, waited + delay)
+        return delay
+
+    def _release(self, host: _Host):
+        with self._lock:
+            host.in_flight -= 1
+            self._slot_freed.notify_all()
+
+    @contextmanager
+    def slot(self, url: str):
+        """Hold a rate-limited slot for url's host for the duration of the block"""
+        start = time.monotonic()
+        with self._lock:
+            host = self._host(url)
+            host.queued += 1
+            try:
+                while not self._has_slot(host):
+                    remaining = self.max_wait - (time.monotonic() - start) if self.max_wait else None
+                    if remaining is not None and remaining <= 0:
+                        host.rejected += 1
+                        raise RateLimited(f"No free connection slot for {host.name} within {self.max_wait:.0f}s")
+                    self._slot_freed.wait(remaining)
+                delay = self._reserve(host, time.monotonic() - start)
+            finally:
+                host.queued -= 1
+        try:
+            if delay:
+                time.sleep(delay)
+            yield
+        finally:
+            self._release(host)
+
+    @asynccontextmanager
+    async def slot_async(self, url: str):
+        """slot() for coroutines; waiting yields to the event loop"""
+        start = time.monotonic()
+        with self._lock:
+            host = self._host(url)
+            host.queued += 1
+        try:
+            while True:
+                with self._lock:
+                    if self._has_slot(host):
+                        delay = self._reserve(host, time.monotonic() - start)
+                        break
+                    if self.max_wait and time.monotonic() - start >= self.max_wait:
+                        host.rejected += 1
+                        raise RateLimited(f"No free connection slot for {host.name} within {self.max_wait:.0f}s")
+                await asyncio.sleep(0.05)
+        finally:
+            with self._lock:
+                host.queued -= 1
+        try:
+            if delay:
+                await asyncio.sleep(delay)
+            yield
+        finally:
+            self._release(host)
+
+    def observe(self, url: str, status: int, headers: Mapping[str, str]):
+        """Block the host after a 429, or a 503 that says when to come back"""
+        retry_after = parse_retry_after(headers.get("Retry-After"))
+        if status != 429 and not (status == 503 and retry_after is not None):
+            return
+        with self._lock:
+            host = self._host(url)
+            host.throttled += 1
+            wait = retry_after if retry_after is not None else DEFAULT_RETRY_AFTER
+            host.blocked_until = max(host.blocked_until, time.monotonic() + wait)
+        print(f"🐢 {host.name} asked us to slow down (HTTP {status}); pausing {wait:.0f}s")
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-host queue depth, in-flight requests, throttling and wait times"""
+        now = time.monotonic()
+        with self._lock:
+            return {
+                name: {
+                    "in_flight": host.in_flight,
+                    "queued": host.queued,
+                    "requests": host.requests,
+                    "throttled": host.throttled,
+                    "rejected": host.rejected,
+                    "wait_seconds_total": round(host.wait_total, 3),
+                    "wait_seconds_max": round(host.wait_max, 3),
+                    "blocked_for": round(max(0.0, host.blocked_until - now), 1),
+                }
+                for name, host in self._hosts.items()
+            }
+
+
+_limiter: Optional[RateLimiter] = None
+_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Return the process-wide limiter shared by every scraper, creating it on first use"""
+    global _limiter
+    if _limiter is None:
+        with _limiter_lock:
+            if _limiter is None:
+                _limiter = RateLimiter.from_env()
+    return _limiter
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Retries, circuit breakers and deadlines for source scrapes
+RetryPolicy retries transient failures (connection errors, timeouts, 5xx)
+with exponential backoff and full jitter. CircuitBreaker stops calling a
+source after repeated request failures and lets one trial call through once
+its cooldown has passed. Deadline bounds the total time a scrape may take.
+"""
+
+import asyncio
+import os
+import random
+import threading
+import time
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, Optional, TypeVar
+
+import requests
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+T = TypeVar("T")
+
+# Seconds a single source scrape may take in total, retries included
+SOURCE_DEADLINE = float(os.environ.get("SCRAPE_SOURCE_DEADLINE", 30))
+
+
+class DeadlineExceeded(requests.Timeout):
+    """A scrape ran past its total time budget"""
+
+
+class Deadline:
+    """Point in time a scrape must finish by; None seconds means no limit"""
+
+    def __init__(self, seconds: Optional[float], parent: Optional["Deadline"] = None):
+        self.seconds = seconds
+        self.expires = time.monotonic() + seconds if seconds else None
+        # A nested deadline never outlives the one it runs under
+        if parent is not None and parent.expires is not None:
+            self.expires = parent.expires if self.expires is None else min(self.expires, parent.expires)
+
+    def remaining(self) -> Optional[float]:
+        if self.expires is None:
+            return None
+        return max(0.0, self.expires - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        return self.expires is not None and time.monotonic() >= self.expires
+
+    def check(self, what: str = "Scrape"):
+        """Raise DeadlineExceeded once the deadline has passed"""
+        if self.expired:
+            raise DeadlineExceeded(f"{what} ran past its deadline")
+
+
+# Upstream statuses worth asking again; 429 is left to the rate limiter's Retry-After handling
+RETRY_STATUSES = frozenset([500, 502, 503, 504])
+
+
+def is_transient(error: BaseException) -> bool:
+    """Whether a failed fetch may succeed if simply tried again"""
+    if isinstance(error, DeadlineExceeded):
+        return False
+    if isinstance(error, (requests.ConnectionError, requests.Timeout, asyncio.TimeoutError)):
+        return True
+    if isinstance(error, requests.HTTPError):
+        return error.response is not None and error.response.status_code in RETRY_STATUSES
+    if aiohttp is not None:
+        if isinstance(error, aiohttp.ClientResponseError):
+            return error.status in RETRY_STATUSES
+        return isinstance(error, (aiohttp.ClientConnectionError, aiohttp.ClientPayloadError))
+    return False
+
+
+class RetryPolicy:
+    def __init__(self, retries: int = 2, backoff: float = 0.5, max_backoff: float = 8):
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+
+    @classmethod
+    def from_env(cls) -> "RetryPolicy":
+        """Build a policy configured by SCRAPE_RETRIES / SCRAPE_RETRY_BACKOFF / SCRAPE_RETRY_MAX_BACKOFF"""
+        return cls(
+            retries=int(os.environ.get("SCRAPE_RETRIES", 2)),
+            backoff=float(os.environ.get("SCRAPE_RETRY_BACKOFF", 0.5)),
+            max_backoff=float(os.environ.get("SCRAPE_RETRY_MAX_BACKOFF", 8)),
+        )
+
+    def delay(self, attempt: int) -> float:
+        """Full-jitter backoff before retry number `attempt` (1-based)"""
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2 ** (attempt - 1)))
+
+    def _should_retry(self, attempt: int, error: BaseException, name: str,
+                      deadline: Optional[Deadline]) -> Optional[float]:
+        if attempt > self.retries or not is_transient(error):
+            return None
+        delay = self.delay(attempt)
+        remaining = deadline.remaining() if deadline else None
+        if remaining is not None and delay >= remaining:
+            return None
+        print(f"🔁 {name}: {str(error) or type(error).__name__}; retry {attempt}/{self.retries} in {delay:.1f}s")
+        return delay
+
+    def call(self, fetch: Callable[[], T], name: str = "request", deadline: Optional[Deadline] = None) -> T:
+        """Run fetch, retrying transient failures while the deadline allows; the last error is re-raised"""
+        attempt = 0
+        while True:
+            try:
+                return fetch()
+            except Exception as e:
+                attempt += 1
+                delay = self._should_retry(attempt, e, name, deadline)
+                if delay is None:
+                    raise
+            time.sleep(delay)
+
+    async def call_async(self, fetch: Callable[[], Awaitable[T]], name: str = "request",
+                         deadline: Optional[Deadline] = None) -> T:
+        """call() for coroutines"""
+        attempt = 0
+        while True:
+            try:
+                return await fetch()
+            except Exception as e:
+                attempt += 1
+                delay = self._should_retry(attempt, e, name, deadline)
+                if delay is None:
+                    raise
+            await asyncio.sleep(delay)
+
+
+class CircuitBreaker:
+    """closed -> open after `threshold` consecutive failures -> half-open after `cooldown`
+    seconds, where one trial call decides between closed and open again"""
+
+    def __init__(self, threshold: int = 3, cooldown: float = 300):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._trial_running = False
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> "CircuitBreaker":
+        """Build a breaker configured by SCRAPE_BREAKER_THRESHOLD / SCRAPE_BREAKER_COOLDOWN"""
+        return cls(
+            threshold=int(os.environ.get("SCRAPE_BREAKER_THRESHOLD", 3)),
+            cooldown=float(os.environ.get("SCRAPE_BREAKER_COOLDOWN", 300)),
+        )
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        return "half_open" if time.monotonic() - self.opened_at >= self.cooldown else "open"
+
+    def allow(self) -> bool:
+        """Whether a call may go ahead now; in half-open state only one at a time"""
+        with self._lock:
+            state = self.state
+            if state == "closed" or not self.threshold:
+                return True
+            if state == "half_open" and not self._trial_running:
+                self._trial_running = True
+                return True
+            return False
+
+    def retry_in(self) -> float:
+        """Seconds until the breaker lets a trial call through"""
+        if self.opened_at is None:
+            return 0.0
+        return max(0.0, self.cooldown - (time.monotonic() - self.opened_at))
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._trial_running = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self._trial_running or (self.threshold and self.failures >= self.threshold):
+                self.opened_at = time.monotonic()
+            self._trial_running = False
+
+    def status(self) -> Dict[str, Any]:
+        with self._lock:
+            retry_in = self.retry_in()
+            return {
+                "state": self.state,
+                "consecutive_failures": self.failures,
+                "retry_at": datetime.fromtimestamp(time.time() + retry_in).isoformat() if self.opened_at else None,
+            }
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Background scrape scheduler
+Runs each registered scrape job on its own interval in a daemon thread,
+with jitter between runs and exponential backoff after failures, and keeps
+the latest result of every job in memory for the API to serve.
+"""
+
+import random
+import threading
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional
+
+from shared_state import snapshot_age
+
+
+class _Job:
+    def __init__(self, name: str, fetch: Callable[[], Dict[str, Any]], interval: float):
+        self.name = name
+        self.fetch = fetch
+        self.interval = interval
+        self.result: Optional[Dict[str, Any]] = None
+        self.last_scrape: Optional[str] = None
+        self.last_success: Optional[str] = None
+        self.last_error: Optional[str] = None
+        self.failures = 0
+        self.next_run: Optional[float] = None
+        self.thread: Optional[threading.Thread] = None
+
+
+class ScrapeScheduler:
+    def __init__(self, jitter: float = 0.1, retry_base: float = 30, max_backoff: float = 1800, shared=None,
+                 leader=None, max_age_intervals: float = 3):
+        # shared: optional shared_state.SnapshotStore; the running scheduler publishes
+        # to it, and processes without one read from it while leader (a
+        # shared_state.LeaderLock) shows a scheduler running in another process.
+        # Snapshots older than max_age_intervals job intervals are not served.
+        self.shared = shared
+        self.leader = leader
+        self.max_age_intervals = max_age_intervals
+        self.jitter = jitter
+        self.retry_base = retry_base
+        self.max_backoff = max_backoff
+        self._jobs: Dict[str, _Job] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+
+    @property
+    def running(self) -> bool:
+        return any(job.thread and job.thread.is_alive() for job in self._jobs.values())
+
+    def add_job(self, name: str, fetch: Callable[[], Dict[str, Any]], interval: float):
+        """Register a scrape job; it starts with the scheduler"""
+        self._jobs[name] = _Job(name, fetch, interval)
+
+    def start(self):
+        """Start one daemon thread per registered job"""
+        self._stop.clear()
+        for job in self._jobs.values():
+            if job.thread and job.thread.is_alive():
+                continue
+            job.thread = threading.Thread(target=self._loop, args=(job,), name=f"scheduler-{job.name}", daemon=True)
+            job.thread.start()
+        print(f"⏰ Scheduler started with {len(self._jobs)} jobs")
+
+    def stop(self, timeout: Optional[float] = None):
+        """Signal every job to stop and wait for the threads to exit"""
+        self._stop.set()
+        for job in self._jobs.values():
+            if job.thread:
+                job.thread.join(timeout)
+
+    def _loop(self, job: _Job):
+        while not self._stop.is_set():
+            self.run_job(job.name)
+            delay = self._next_delay(job)
+            job.next_run = time.time() + delay
+            self._stop.wait(delay)
+
+    def _next_delay(self, job: _Job) -> float:
+        """Interval after success, exponential backoff after failures, both jittered"""
+        if job.failures:
+            delay = min(self.retry_base * 2 ** (job.failures - 1), self.max_backoff)
+        else:
+            delay = job.interval
+        return max(1.0, delay * random.uniform(1 - self.jitter, 1 + self.jitter))
+
+    def run_job(self, name: str) -> Dict[str, Any]:
+        """Run a job once now and record its result"""
+        job = self._jobs[name]
+        try:
+            result = job.fetch()
+        except Exception as e:
+            result = {"error": f"Scheduled scrape failed: {str(e)}"}
+
+        now = datetime.now().isoformat()
+        with self._lock:
+            job.last_scrape = now
+            if result.get("error"):
+                job.failures += 1
+                job.last_error = result["error"]
+                # Keep serving the last good result; only fill in the error if there is none
+                if job.result is None or job.result.get("error"):
+                    job.result = result
+            else:
+                job.failures = 0
+                job.last_error = None
+                job.last_success = now
+                job.result = result
+            status = self._job_status(job)
+        if self.shared is not None:
+            try:
+                self.shared.save(name, job.result, status)
+            except Exception as e:
+                print(f"⚠️ Could not publish snapshot for {name}: {e}")
+        return result
+
+    def snapshot(self, name: str) -> Optional[Dict[str, Any]]:
+        """Latest result of a job, or None if it has not run yet"""
+        job = self._jobs.get(name)
+        if job is None:
+            return None
+        if job.result is None and self._reads_shared():
+            return self.shared.load(name, max_age=self._max_age(job))
+        return job.result
+
+    def _reads_shared(self) -> bool:
+        """Whether this process serves snapshots published by another process's scheduler"""
+        return (self.shared is not None and not self.running
+                and (self.leader is None or self.leader.held_elsewhere()))
+
+    def _max_age(self, job: _Job) -> float:
+        return job.interval * self.max_age_intervals
+
+    def _job_status(self, job: _Job) -> Dict[str, Any]:
+        return {
+            "last_scrape": job.last_scrape,
+            "last_success": job.last_success,
+            "last_error": job.last_error,
+            "consecutive_failures": job.failures,
+            "interval": job.interval,
+            "next_run": datetime.fromtimestamp(job.next_run).isoformat() if job.next_run else None,
+        }
+
+    def status(self) -> Dict[str, Dict[str, Any]]:
+        """Per-job scrape times, failure counts and next run"""
+        with self._lock:
+            statuses = {name: self._job_status(job) for name, job in self._jobs.items()}
+        if self._reads_shared():
+            for name, status in self.shared.statuses().items():
+                job = self._jobs.get(name)
+                if job is not None and snapshot_age(status.get("last_scrape")) <= self._max_age(job):
+                    statuses[name] = status
+        return statuses
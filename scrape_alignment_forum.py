@@ -5,27 +5,47 @@ Scrapes news posts from https://www.alignmentforum.org/
 """
 
 import requests
-from bs4 import BeautifulSoup
 import json
 import time
 from datetime import datetime
 import re
+from parsing import make_soup
+from article_store import ArticleStore
+from enrichment import ENRICH_ARTICLES, get_enricher
+from http_client import fetch_page, get_session
+from resilience import SOURCE_DEADLINE, Deadline
+
+# Selector patterns, compiled once at import
+POSTS_CONTAINER_RE = re.compile(r'PostsList')
+POST_SPAN_RE = re.compile(r'post_')
+POST_SPAN_FALLBACK_RE = re.compile(r'post')
+TITLE_CLASS_RE = re.compile(r'Title')
+AUTHOR_CLASS_RE = re.compile(r'Author')
+USER_CLASS_RE = re.compile(r'User')
+DATE_CLASS_RE = re.compile(r'Date')
+TIME_CLASS_RE = re.compile(r'Time')
+EXCERPT_CLASS_RE = re.compile(r'Excerpt')
+BODY_CLASS_RE = re.compile(r'Body')
+
 
 class AlignmentForumScraper:
-    def __init__(self):
+    def __init__(self, enrich=None):
         self.base_url = "https://www.alignmentforum.org/"
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         }
+        self.session = get_session()
+        # Read each article's own page for its date, author, excerpt and word count
+        self.enrich = enrich if enrich is not None else ENRICH_ARTICLES
     
     def scrape_news(self):
         """Scrape news posts from the main page"""
         try:
             print(f"Scraping {self.base_url}...")
-            response = requests.get(self.base_url, headers=self.headers, timeout=10)
+            response = fetch_page(self.session, self.base_url, Deadline(SOURCE_DEADLINE), headers=self.headers)
             response.raise_for_status()
             
-            soup = BeautifulSoup(response.content, 'html.parser')
+            soup = make_soup(response.content, region="ai_alignment_forum")
             
             # Find the posts container
             posts_container = soup.find('div', class_='PostsList2-postsBoxShadow')
@@ -33,17 +53,17 @@ class AlignmentForumScraper:
             if not posts_container:
                 print("Posts container not found. Looking for alternative selectors...")
                 # Try alternative selectors
-                posts_container = soup.find('div', class_=re.compile(r'PostsList.*'))
+                posts_container = soup.find('div', class_=POSTS_CONTAINER_RE)
                 if not posts_container:
                     return {"error": "Posts container not found"}
             
             # Find all post spans
-            post_spans = posts_container.find_all('span', class_=re.compile(r'post_.*'))
+            post_spans = posts_container.find_all('span', class_=POST_SPAN_RE)
             
             if not post_spans:
                 print("Post spans not found. Looking for alternative selectors...")
                 # Try alternative selectors
-                post_spans = posts_container.find_all('span', class_=re.compile(r'.*post.*'))
+                post_spans = posts_container.find_all('span', class_=POST_SPAN_FALLBACK_RE)
             
             news_items = []
             
@@ -54,7 +74,7 @@ class AlignmentForumScraper:
                     
                     if not title_element:
                         # Try alternative title selectors
-                        title_element = post_span.find('span', class_=re.compile(r'.*Title.*'))
+                        title_element = post_span.find('span', class_=TITLE_CLASS_RE)
                         if not title_element:
                             title_element = post_span.find('a')  # Sometimes title is in an anchor tag
                     
@@ -71,21 +91,21 @@ class AlignmentForumScraper:
                     date = "Unknown"
                     
                     # Look for author info
-                    author_element = post_span.find('span', class_=re.compile(r'.*Author.*')) or \
-                                  post_span.find('span', class_=re.compile(r'.*User.*'))
+                    author_element = post_span.find('span', class_=AUTHOR_CLASS_RE) or \
+                                  post_span.find('span', class_=USER_CLASS_RE)
                     if author_element:
                         author = author_element.get_text(strip=True)
                     
                     # Look for date info
-                    date_element = post_span.find('span', class_=re.compile(r'.*Date.*')) or \
-                                 post_span.find('span', class_=re.compile(r'.*Time.*'))
+                    date_element = post_span.find('span', class_=DATE_CLASS_RE) or \
+                                 post_span.find('span', class_=TIME_CLASS_RE)
                     if date_element:
                         date = date_element.get_text(strip=True)
                     
                     # Try to find excerpt/description
                     excerpt = ""
-                    excerpt_element = post_span.find('div', class_=re.compile(r'.*Excerpt.*')) or \
-                                   post_span.find('div', class_=re.compile(r'.*Body.*'))
+                    excerpt_element = post_span.find('div', class_=EXCERPT_CLASS_RE) or \
+                                   post_span.find('div', class_=BODY_CLASS_RE)
                     if excerpt_element:
                         excerpt = excerpt_element.get_text(strip=True)[:200] + "..." if len(excerpt_element.get_text(strip=True)) > 200 else excerpt_element.get_text(strip=True)
                     
@@ -118,13 +138,14 @@ class AlignmentForumScraper:
                         "scraped_at": datetime.now().isoformat()
                     })
             
-            return {
+            result = {
                 "success": True,
                 "source": self.base_url,
                 "total_posts": len(news_items),
                 "posts": news_items,
                 "scraped_at": datetime.now().isoformat()
             }
+            return get_enricher().enrich_result(result, headers=self.headers, field="posts") if self.enrich else result
             
         except requests.RequestException as e:
             return {"error": f"Request failed: {str(e)}"}
@@ -139,6 +160,14 @@ class AlignmentForumScraper:
             print(f"Data saved to {filename}")
         except Exception as e:
             print(f"Error saving file: {e}")
+    
+    def save_to_store(self, data, store=None):
+        """Upsert scraped articles into the persistent article store"""
+        try:
+            counts = (store or ArticleStore()).upsert("ai_alignment_forum", data.get("posts", []))
+            print(f"Stored {counts['new']} new and {counts['updated']} updated articles")
+        except Exception as e:
+            print(f"Error saving to store: {e}")
 
 def main():
     scraper = AlignmentForumScraper()
@@ -158,6 +187,7 @@ def main():
         
         # Save to file
         scraper.save_to_file(news_data)
+        scraper.save_to_store(news_data)
         
     else:
         print(f"❌ Error: {news_data.get('error', 'Unknown error')}")
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+In-process response cache for the scraping endpoints
+Entries are keyed by (endpoint, source), served fresh for `ttl` seconds and
+served stale for up to `stale_ttl` more while a single background refresh runs.
+Concurrent misses for the same key are collapsed into one upstream fetch.
+"""
+
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+CacheKey = Tuple[str, str]
+
+
+class _Flight:
+    """A fetch in progress that other callers, sync or async, can wait on"""
+
+    def __init__(self):
+        self.future: Future = Future()
+        # Background refresh task of the async path; referenced so it is not collected
+        self.task: Optional[asyncio.Task] = None
+
+
+class ScrapeCache:
+    def __init__(self, ttl: float = 300, stale_ttl: float = 3600):
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self._entries: Dict[CacheKey, Tuple[float, Dict[str, Any]]] = {}
+        self._flights: Dict[CacheKey, _Flight] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> "ScrapeCache":
+        """Build a cache configured by SCRAPE_CACHE_TTL / SCRAPE_CACHE_STALE_TTL"""
+        return cls(
+            ttl=float(os.environ.get("SCRAPE_CACHE_TTL", 300)),
+            stale_ttl=float(os.environ.get("SCRAPE_CACHE_STALE_TTL", 3600)),
+        )
+
+    def _claim(self, key: CacheKey, refresh: Callable[[Any, _Flight], None]) -> Tuple[Optional[Dict[str, Any]], Optional[_Flight], bool]:
+        """Cached value for key, or the flight to wait on and whether the caller must run it.
+
+        A stale entry is returned as-is after `refresh(key, flight)` has been
+        asked to start a background refresh, unless one is already running.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry:
+                age = time.monotonic() - entry[0]
+                if age < self.ttl:
+                    return entry[1], None, False
+                if age < self.ttl + self.stale_ttl:
+                    # Stale: answer now, refresh in the background unless already running
+                    if key not in self._flights:
+                        self._flights[key] = _Flight()
+                        refresh(key, self._flights[key])
+                    return entry[1], None, False
+
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+            return None, flight, leader
+
+    def get_or_fetch(self, key: CacheKey, fetch: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+        """Return the cached value for key, fetching it at most once at a time"""
+        def refresh(key, flight):
+            threading.Thread(
+                target=self._run, args=(key, fetch, flight),
+                name=f"cache-refresh-{key[0]}", daemon=True
+            ).start()
+
+        value, flight, leader = self._claim(key, refresh)
+        if flight is None:
+            return value
+        if leader:
+            self._run(key, fetch, flight)
+        return flight.future.result()
+
+    async def get_or_fetch_async(self, key: CacheKey, fetch: Callable[[], Awaitable[Dict[str, Any]]]) -> Dict[str, Any]:
+        """get_or_fetch for coroutines; waiting never blocks the event loop.
+
+        Shares entries and in-flight fetches with the sync path, so a sync and
+        an async caller asking for the same key still cause one upstream fetch.
+        """
+        def refresh(key, flight):
+            flight.task = asyncio.ensure_future(self._run_async(key, fetch, flight))
+
+        value, flight, leader = self._claim(key, refresh)
+        if flight is None:
+            return value
+        if leader:
+            await self._run_async(key, fetch, flight)
+        return await asyncio.wrap_future(flight.future)
+
+    def _run(self, key: CacheKey, fetch: Callable[[], Dict[str, Any]], flight: _Flight):
+        """Execute fetch for key and publish the result to waiters"""
+        try:
+            value = fetch()
+        except BaseException as e:
+            self._publish(key, flight, error=e)
+        else:
+            self._publish(key, flight, value=value)
+
+    async def _run_async(self, key: CacheKey, fetch: Callable[[], Awaitable[Dict[str, Any]]], flight: _Flight):
+        try:
+            value = await fetch()
+        except BaseException as e:
+            self._publish(key, flight, error=e)
+        else:
+            self._publish(key, flight, value=value)
+
+    def _publish(self, key: CacheKey, flight: _Flight, value: Optional[Dict[str, Any]] = None,
+                 error: Optional[BaseException] = None):
+        # Only complete, successful scrapes are cached; errors and results cut
+        # short by a deadline are retried on the next call
+        with self._lock:
+            if error is None and not value.get("error") and not value.get("partial"):
+                self._entries[key] = (time.monotonic(), value)
+            self._flights.pop(key, None)
+        if error is not None:
+            flight.future.set_exception(error)
+        else:
+            flight.future.set_result(value)
+
+    def invalidate(self, key: Optional[CacheKey] = None):
+        """Drop one entry, or every entry when key is None"""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    def stats(self) -> Dict[str, Any]:
+        """Describe cached entries and their ages"""
+        now = time.monotonic()
+        with self._lock:
+            return {
+                "ttl": self.ttl,
+                "stale_ttl": self.stale_ttl,
+                "entries": {f"{k[0]}:{k[1]}": round(now - t, 1) for k, (t, _) in self._entries.items()},
+                "in_flight": [f"{k[0]}:{k[1]}" for k in self._flights],
+            }
@@ -5,34 +5,49 @@ Scrapes AI-related news from https://news.mit.edu/topic/artificial-intelligence2
 """
 
 import requests
-from bs4 import BeautifulSoup
 import json
 import re
 from datetime import datetime
 import time
+from parsing import make_soup
+from extractors import discover_blocks
+from article_store import ArticleStore
+from enrichment import ENRICH_ARTICLES, get_enricher
+from http_client import fetch_page, get_session
+from resilience import SOURCE_DEADLINE, Deadline
+
+# Selector patterns, compiled once at import
+ARTICLE_CLASS_RE = re.compile(r'article|news|story')
+LONG_DATE_RE = re.compile(r'\b(?:January|February|March|April|May|June|July|August|September|October|November|December)\s+\d{1,2},?\s+\d{4}\b')
+EXCERPT_CLASS_RE = re.compile(r'excerpt|summary|description')
+BYLINE_TEXT_RE = re.compile(r'By\s+\w+')
+
 
 class MITNewsScraper:
-    def __init__(self):
+    def __init__(self, enrich=None):
         self.base_url = "https://news.mit.edu/topic/artificial-intelligence2"
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         }
+        self.session = get_session()
+        # Read each article's own page for its date, author, excerpt and word count
+        self.enrich = enrich if enrich is not None else ENRICH_ARTICLES
     
     def scrape_news(self):
         """Scrape AI news from MIT News"""
         try:
             print(f"Scraping {self.base_url}...")
-            response = requests.get(self.base_url, headers=self.headers, timeout=15)
+            response = fetch_page(self.session, self.base_url, Deadline(SOURCE_DEADLINE), headers=self.headers)
             response.raise_for_status()
             
-            soup = BeautifulSoup(response.content, 'html.parser')
+            soup = make_soup(response.content, region="mit_news")
             
             # Find all news articles - MIT News typically uses article tags or div containers
-            articles = soup.find_all(['article', 'div'], class_=re.compile(r'.*article.*|.*news.*|.*story.*'))
+            articles = soup.find_all(['article', 'div'], class_=ARTICLE_CLASS_RE)
             
             if not articles:
-                # Fallback: look for any divs that might contain news
-                articles = soup.find_all('div', class_=re.compile(r'.*'))
+                # Fallback: blocks around headline links (stops after 15)
+                articles = discover_blocks(soup, 15)
             
             news_items = []
             
@@ -58,24 +73,24 @@ class MITNewsScraper:
                     
                     # Try to find date - MIT News often shows dates prominently
                     date = "Unknown"
-                    date_element = article.find(text=re.compile(r'\b(?:January|February|March|April|May|June|July|August|September|October|November|December)\s+\d{1,2},?\s+\d{4}\b'))
+                    date_element = article.find(text=LONG_DATE_RE)
                     if date_element:
                         date = date_element.strip()
                     else:
                         # Look for date in parent elements
-                        date_parent = article.find_parent(text=re.compile(r'\b(?:January|February|March|April|May|June|July|August|September|October|November|December)\s+\d{1,2},?\s+\d{4}\b'))
+                        date_parent = article.find_parent(text=LONG_DATE_RE)
                         if date_parent:
                             date = date_parent.strip()
                     
                     # Try to find excerpt/description
                     excerpt = ""
-                    excerpt_element = article.find(['p', 'div'], class_=re.compile(r'.*excerpt.*|.*summary.*|.*description.*'))
+                    excerpt_element = article.find(['p', 'div'], class_=EXCERPT_CLASS_RE)
                     if excerpt_element:
                         excerpt = excerpt_element.get_text(strip=True)[:200] + "..." if len(excerpt_element.get_text(strip=True)) > 200 else excerpt_element.get_text(strip=True)
                     
                     # Try to find author
                     author = "MIT News"
-                    author_element = article.find(text=re.compile(r'By\s+\w+'))
+                    author_element = article.find(text=BYLINE_TEXT_RE)
                     if author_element:
                         author = author_element.strip()
                     
@@ -112,13 +127,14 @@ class MITNewsScraper:
                         "scraped_at": datetime.now().isoformat()
                     })
             
-            return {
+            result = {
                 "success": True,
                 "source": self.base_url,
                 "total_articles": len(news_items),
                 "articles": news_items,
                 "scraped_at": datetime.now().isoformat()
             }
+            return get_enricher().enrich_result(result, headers=self.headers, default_author="MIT News") if self.enrich else result
             
         except requests.RequestException as e:
             return {"error": f"Request failed: {str(e)}"}
@@ -133,6 +149,14 @@ class MITNewsScraper:
             print(f"Data saved to {filename}")
         except Exception as e:
             print(f"Error saving file: {e}")
+    
+    def save_to_store(self, data, store=None):
+        """Upsert scraped articles into the persistent article store"""
+        try:
+            counts = (store or ArticleStore()).upsert("mit_news", data.get("articles", []))
+            print(f"Stored {counts['new']} new and {counts['updated']} updated articles")
+        except Exception as e:
+            print(f"Error saving to store: {e}")
 
 def main():
     scraper = MITNewsScraper()
@@ -152,6 +176,7 @@ def main():
         
         # Save to file
         scraper.save_to_file(news_data)
+        scraper.save_to_store(news_data)
         
     else:
         print(f"❌ Error: {news_data.get('error', 'Unknown error')}")
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+State shared between server worker processes
+SnapshotStore keeps the scheduler's latest per-source results in SQLite so
+every worker serves the same data, and LeaderLock makes sure only one worker
+runs the scheduler at a time.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+try:
+    import fcntl
+except ImportError:
+    # Windows: lock a byte of the file with msvcrt instead of flock
+    fcntl = None
+    import msvcrt
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS snapshots (
+    name       TEXT PRIMARY KEY,
+    result     TEXT NOT NULL,
+    status     TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+"""
+
+
+class SnapshotStore:
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or os.environ.get("ARTICLE_STORE_PATH", "articles.db")
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def save(self, name: str, result: Optional[Dict[str, Any]], status: Dict[str, Any]):
+        """Publish a job's latest result and status"""
+        if result is None:
+            return
+        conn = self._connect()
+        with conn:
+            conn.execute(
+                """INSERT INTO snapshots (name, result, status, updated_at) VALUES (?, ?, ?, ?)
+                   ON CONFLICT (name) DO UPDATE SET
+                       result = excluded.result, status = excluded.status, updated_at = excluded.updated_at""",
+                (name, json.dumps(result), json.dumps(status), status.get("last_scrape") or ""))
+
+    def load(self, name: str, max_age: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """Latest published result of a job, None if it is older than max_age seconds"""
+        row = self._connect().execute("SELECT result, updated_at FROM snapshots WHERE name = ?", (name,)).fetchone()
+        if row is None or (max_age is not None and snapshot_age(row[1]) > max_age):
+            return None
+        return json.loads(row[0])
+
+    def statuses(self) -> Dict[str, Dict[str, Any]]:
+        """Published status of every job"""
+        return {name: json.loads(status)
+                for name, status in self._connect().execute("SELECT name, status FROM snapshots")}
+
+
+def snapshot_age(updated_at: Optional[str]) -> float:
+    """Seconds since a snapshot's updated_at (local ISO time); infinite if unknown"""
+    try:
+        return (datetime.now() - datetime.fromisoformat(updated_at)).total_seconds()
+    except (TypeError, ValueError):
+        return float("inf")
+
+
+def _try_lock(f) -> bool:
+    try:
+        if fcntl is not None:
+            fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+    except OSError:
+        return False
+    return True
+
+
+def _unlock(f):
+    if fcntl is not None:
+        fcntl.flock(f, fcntl.LOCK_UN)
+    else:
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+class LeaderLock:
+    """Non-blocking exclusive file lock; held by the one process that runs the scheduler"""
+
+    def __init__(self, path: Optional[str] = None, probe_interval: float = 5):
+        self.path = path or os.environ.get("SCHEDULER_LOCK_PATH", "scheduler.lock")
+        self._file = None
+        # held_elsewhere() answers from its last probe for this many seconds
+        self.probe_interval = probe_interval
+        self._probed_at = 0.0
+        self._elsewhere = False
+        self._probe_lock = threading.Lock()
+
+    @property
+    def held(self) -> bool:
+        return self._file is not None
+
+    def acquire(self) -> bool:
+        if self._file is not None:
+            return True
+        f = open(self.path, "a+")
+        if not _try_lock(f):
+            f.close()
+            return False
+        self._file = f
+        return True
+
+    def release(self):
+        if self._file is not None:
+            _unlock(self._file)
+            self._file.close()
+            self._file = None
+
+    def held_elsewhere(self) -> bool:
+        """Whether another process holds the lock, i.e. a scheduler is running there"""
+        if self._file is not None:
+            return False
+        with self._probe_lock:
+            if time.monotonic() - self._probed_at >= self.probe_interval:
+                with open(self.path, "a+") as f:
+                    self._elsewhere = not _try_lock(f)
+                    if not self._elsewhere:
+                        _unlock(f)
+                self._probed_at = time.monotonic()
+            return self._elsewhere
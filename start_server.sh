@@ -1,6 +1,11 @@
 #!/bin/bash
 
 # AI Alignment Forum News Scraper - Startup Script
+# Usage: ./start_server.sh        development server (debug, auto-reload)
+#        ./start_server.sh prod   gunicorn with WEB_WORKERS x WEB_THREADS
+#        ./start_server.sh asgi   gunicorn with WEB_WORKERS uvicorn workers (async /api/universal-scrape)
+
+MODE="${1:-dev}"
 
 echo "🚀 Starting AI Alignment Forum News Scraper..."
 echo "📁 Activating virtual environment..."
@@ -8,16 +13,28 @@ echo "📁 Activating virtual environment..."
 # Activate virtual environment
 source venv/bin/activate
 
-echo "🔧 Installing/updating dependencies..."
-pip install -r requirements.txt
+# Only reinstall when requirements.txt changed since the last install
+STAMP="venv/.requirements.installed"
+if ! cmp -s requirements.txt "$STAMP"; then
+    echo "🔧 Installing/updating dependencies..."
+    pip install -r requirements.txt && cp requirements.txt "$STAMP"
+fi
 
-echo "🌐 Starting Flask server on port 5001..."
+echo "🌐 Starting server on port 5001 ($MODE mode)..."
 echo "📱 Frontend: http://localhost:5001"
 echo "🔌 API: http://localhost:5001/api/scrape"
 echo "💚 Health: http://localhost:5001/api/health"
+echo "✅ Ready: http://localhost:5001/api/ready"
 echo ""
 echo "Press Ctrl+C to stop the server"
 echo ""
 
-# Start the Flask application
-python app.py
+if [ "$MODE" = "prod" ]; then
+    # exec so gunicorn receives SIGTERM directly and shuts down gracefully
+    exec gunicorn -c gunicorn.conf.py wsgi:application
+elif [ "$MODE" = "asgi" ]; then
+    exec gunicorn -c gunicorn.conf.py -k uvicorn.workers.UvicornWorker asgi:application
+else
+    # Start the Flask development server
+    exec python app.py
+fi
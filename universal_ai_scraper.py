@@ -9,290 +9,552 @@ Scrapes AI news from multiple sources:
 """
 
 import requests
-from bs4 import BeautifulSoup
+import argparse
 import json
-import re
+import os
 from datetime import datetime
 import time
-from typing import Dict, List, Any
+import asyncio
+import io
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeout, as_completed
+from typing import Callable, Dict, Iterator, List, Any, Optional, Tuple
+from parsing import make_soup
+from extractors import COMPILED_SELECTORS, extract_articles, pagination_links
+from feeds import parse_feed
+from article_store import ArticleStore, normalize_url
+from crawler import Crawler
+from enrichment import ENRICH_ARTICLES, get_enricher
+from resilience import SOURCE_DEADLINE, CircuitBreaker, Deadline, RetryPolicy
+from profiling import PROFILE_DIR, ScrapeProfiler
+from incremental import KnownLinks, SeenArticles
+from metrics import EXTRACT_SECONDS, FETCH_SECONDS, PARSE_SECONDS, RESPONSE_BYTES, record_scrape
+from http_client import (ASYNC_REQUEST_ERRORS, ConditionalCache, DeadlineStream, async_timeout, create_async_session,
+                         fetch_page, get_session, limited_get, request_timeout)
 
 class UniversalAIScraper:
-    def __init__(self):
+    def __init__(self, max_workers: int = 4, parser: Optional[str] = None, restrict_parsing: bool = True,
+                 use_feeds: bool = True, source_deadline: Optional[float] = None, total_deadline: Optional[float] = None,
+                 incremental: Optional[bool] = None, enrich: Optional[bool] = None):
         self.sources = {
             "ai_alignment_forum": {
                 "url": "https://www.alignmentforum.org/",
                 "name": "AI Alignment Forum",
-                "type": "forum"
+                "type": "forum",
+                "refresh_interval": 300
             },
             "mit_news": {
                 "url": "https://news.mit.edu/topic/artificial-intelligence2",
+                "feed_url": "https://news.mit.edu/rss/topic/artificial-intelligence2",
                 "name": "MIT News AI",
-                "type": "news"
+                "type": "news",
+                "refresh_interval": 900
             },
             "towards_ai": {
                 "url": "https://towardsai.net/p",
+                "feed_url": "https://towardsai.net/feed",
                 "name": "Towards AI",
-                "type": "publication"
+                "type": "publication",
+                "refresh_interval": 900
             },
             "marktechpost": {
                 "url": "https://www.marktechpost.com/",
+                "feed_url": "https://www.marktechpost.com/feed/",
                 "name": "MarkTechPost",
-                "type": "tech_news"
+                "type": "tech_news",
+                "refresh_interval": 600
             }
         }
         
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         }
+        self.session = get_session()
+        self.conditional = ConditionalCache()
+        
+        # Time of the most recent scrape attempt per source
+        self.last_scrape: Dict[str, str] = {}
+        
+        # BeautifulSoup backend (None = parsing.DEFAULT_PARSER) and whether to
+        # build only each source's post-list region
+        self.parser = parser
+        self.restrict_parsing = restrict_parsing
+        
+        # Read RSS/Atom feeds where a source declares feed_url, HTML otherwise
+        self.use_feeds = use_feeds
+        
+        # Upper bound on sources fetched in parallel by scrape_all_sources
+        self.max_workers = max_workers
+        
+        # Transient page-fetch failures are retried; a source whose requests keep
+        # failing is skipped until its breaker's cooldown has passed
+        self.retry = RetryPolicy.from_env()
+        self.breakers = {source_key: CircuitBreaker.from_env() for source_key in self.sources}
+        
+        # Seconds one source (feed, HTML fallback and retries) and a whole
+        # scrape_all_sources run may take; 0 disables a limit
+        self.source_deadline = source_deadline if source_deadline is not None else SOURCE_DEADLINE
+        self.total_deadline = (total_deadline if total_deadline is not None
+                               else float(os.environ.get("SCRAPE_TOTAL_DEADLINE", 45)))
+        
+        # Incremental mode: extraction stops at articles the previous scrape
+        # returned, and results carry only those new ones as new_articles
+        self.incremental = (incremental if incremental is not None
+                            else os.environ.get("SCRAPE_INCREMENTAL", "0") == "1")
+        self.seen = SeenArticles()
+        
+        # Enrichment: fetch each article's own page for its date, author,
+        # excerpt and word count (cached by URL, so each page is read once)
+        self.enrich = enrich if enrich is not None else ENRICH_ARTICLES
+        self.enricher = get_enricher()
     
-    def scrape_source(self, source_key: str) -> Dict[str, Any]:
-        """Scrape a specific source"""
+    def scrape_source(self, source_key: str, deadline: Optional[Deadline] = None) -> Dict[str, Any]:
+        """Scrape a specific source, preferring its feed when it has one.
+        
+        The scrape gives up after source_deadline seconds, or earlier if the
+        caller's deadline (a whole scrape_all_sources run) ends first.
+        """
         source = self.sources[source_key]
+        breaker = self.breakers[source_key]
+        if not breaker.allow():
+            return self._circuit_open(source_key, source)
         print(f"\n🔍 Scraping {source['name']}...")
+        deadline = Deadline(self.source_deadline, parent=deadline)
+        start = time.perf_counter()
         
+        request_failed = False
         try:
-            response = requests.get(source['url'], headers=self.headers, timeout=15)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            if source_key == "ai_alignment_forum":
-                return self._scrape_alignment_forum(soup, source)
-            elif source_key == "mit_news":
-                return self._scrape_mit_news(soup, source)
-            elif source_key == "towards_ai":
-                return self._scrape_towards_ai(soup, source)
-            elif source_key == "marktechpost":
-                return self._scrape_marktechpost(soup, source)
-            else:
-                return {"error": f"Unknown source: {source_key}"}
+            result = None
+            if self.use_feeds and source.get("feed_url"):
+                result = self._scrape_feed(source_key, source, deadline)
+                if result is None:
+                    deadline.check(source['name'])
+            if result is None:
+                result = self.retry.call(lambda: self._scrape_html(source_key, source, deadline),
+                                         source['name'], deadline)
                 
         except requests.RequestException as e:
-            return {"error": f"Request failed for {source['name']}: {str(e)}"}
+            request_failed = True
+            if deadline.expired:
+                result = self.timed_out_result(source_key)
+            else:
+                result = {"error": f"Request failed for {source['name']}: {str(e)}"}
         except Exception as e:
-            return {"error": f"Scraping failed for {source['name']}: {str(e)}"}
+            result = {"error": f"Scraping failed for {source['name']}: {str(e)}"}
+        result = self._enrich(source_key, result, deadline)
+        return self._finish(source_key, result, request_failed, start)
     
-    def _scrape_alignment_forum(self, soup: BeautifulSoup, source: Dict) -> Dict[str, Any]:
-        """Scrape AI Alignment Forum"""
-        posts_container = soup.find('div', class_='PostsList2-postsBoxShadow')
-        
-        if not posts_container:
-            posts_container = soup.find('div', class_=re.compile(r'PostsList.*'))
-            if not posts_container:
-                return {"error": "Posts container not found"}
-        
-        post_spans = posts_container.find_all('span', class_=re.compile(r'post_.*'))
-        if not post_spans:
-            post_spans = posts_container.find_all('span', class_=re.compile(r'.*post.*'))
-        
-        news_items = []
-        
-        for post_span in post_spans[:10]:
-            try:
-                title_element = post_span.find('span', class_='PostsTitle-eaTitleDesktopEllipsis')
-                if not title_element:
-                    title_element = post_span.find('span', class_=re.compile(r'.*Title.*')) or post_span.find('a')
-                
-                title = title_element.get_text(strip=True) if title_element else None
-                if not title:
-                    continue
-                
-                link_element = post_span.find('a')
-                link = link_element.get('href') if link_element else None
-                if link and not link.startswith('http'):
-                    link = source['url'].rstrip('/') + link
+    def _finish(self, source_key: str, result: Dict[str, Any], request_failed: bool, start: float) -> Dict[str, Any]:
+        """Record a finished scrape with the source's breaker and the metrics"""
+        self.last_scrape[source_key] = datetime.now().isoformat()
+        if request_failed:
+            self.breakers[source_key].record_failure()
+        else:
+            self.breakers[source_key].record_success()
+        record_scrape(source_key, result, time.perf_counter() - start, request_failed)
+        return result
+    
+    def _circuit_open(self, source_key: str, source: Dict) -> Dict[str, Any]:
+        breaker = self.breakers[source_key]
+        print(f"\n⛔ Skipping {source['name']}: circuit open")
+        result = {
+            "error": f"Skipping {source['name']} after {breaker.failures} failed requests; "
+                     f"next attempt in {breaker.retry_in():.0f}s",
+            "circuit_open": True
+        }
+        record_scrape(source_key, result, 0.0)
+        return result
+    
+    def _enrich(self, source_key: str, result: Dict[str, Any], deadline: Deadline) -> Dict[str, Any]:
+        """Fill in article details from their own pages when enrichment is on"""
+        if not self.enrich or not result.get("success"):
+            return result
+        default_author = COMPILED_SELECTORS.get(source_key, {}).get("author")
+        return self.enricher.enrich_result(result, deadline, self.headers, default_author)
+    
+    def timed_out_result(self, source_key: str) -> Dict[str, Any]:
+        """Result reported for a source that did not finish before its deadline"""
+        source = self.sources[source_key]
+        print(f"⏱️ {source['name']} ran out of time")
+        return {"error": f"{source['name']} did not finish before its deadline", "timed_out": True}
+    
+    def breaker_status(self) -> Dict[str, Dict[str, Any]]:
+        """Circuit breaker state of every source"""
+        return {source_key: breaker.status() for source_key, breaker in self.breakers.items()}
+    
+    def seed_seen(self, store: ArticleStore):
+        """Start incremental scrapes from the newest stored articles of each source"""
+        for source_key in self.sources:
+            self.seen.remember(source_key, store.recent(limit=self.seen.size, source_key=source_key))
+    
+    def _known(self, source_key: str) -> Optional[KnownLinks]:
+        return self.seen.known(source_key) if self.incremental else None
+    
+    def _incremental_result(self, source_key: str, result: Dict[str, Any],
+                            known: Optional[KnownLinks]) -> Dict[str, Any]:
+        """Keep the extracted delta as new_articles and report it merged into the known articles"""
+        if not self.incremental or not result.get("success"):
+            return result
+        new_articles = result["articles"]
+        articles = self.seen.merge(source_key, new_articles)
+        return {**result, "articles": articles, "total_articles": len(articles), "new_articles": new_articles,
+                "stopped_at_known": bool(known and known.done)}
+    
+    def _scrape_feed(self, source_key: str, source: Dict, deadline: Optional[Deadline] = None) -> Optional[Dict[str, Any]]:
+        """Read the source's RSS/Atom feed; None means fall back to the HTML page"""
+        feed_url = source['feed_url']
+        try:
+            headers = {**self.headers, **self.conditional.request_headers(feed_url)}
+            with FETCH_SECONDS.time(source=source_key, via="feed"):
+                response = self.session.get(feed_url, headers=headers, timeout=request_timeout(deadline),
+                                            stream=True)
+            with response:
+                response.raise_for_status()
                 
-                news_items.append({
-                    "title": title,
-                    "author": "Unknown",
-                    "date": "Unknown",
-                    "excerpt": "",
-                    "link": link,
-                    "source": source['name'],
-                    "scraped_at": datetime.now().isoformat()
-                })
+                cached = self.conditional.payload(feed_url)
+                if response.status_code == 304 and cached:
+                    return self._not_modified(cached)
                 
-            except Exception as e:
-                continue
+                # Parse while downloading; the stream undoes gzip/deflate and stops at the deadline
+                stream = DeadlineStream(response.raw, deadline, f"{source['name']} feed")
+                try:
+                    result = self._feed_result(source_key, source, stream)
+                finally:
+                    RESPONSE_BYTES.inc(stream.bytes_read, source=source_key, via="feed")
+        except Exception as e:
+            print(f"⚠️ Feed failed for {source['name']}, using HTML: {e}")
+            return None
         
-        return {
+        if result is not None:
+            self.conditional.store(feed_url, response, result)
+        return result
+    
+    def _scrape_html(self, source_key: str, source: Dict, deadline: Optional[Deadline] = None) -> Dict[str, Any]:
+        """Fetch and extract the source's HTML listing page"""
+        if source_key not in COMPILED_SELECTORS:
+            return {"error": f"Unknown source: {source_key}"}
+        
+        headers = {**self.headers, **self.conditional.request_headers(source['url'])}
+        with FETCH_SECONDS.time(source=source_key, via="html"):
+            response = fetch_page(self.session, source['url'], deadline, headers=headers)
+        RESPONSE_BYTES.inc(len(response.content), source=source_key, via="html")
+        response.raise_for_status()
+        
+        cached = self.conditional.payload(source['url'])
+        if response.status_code == 304 and cached:
+            # Page unchanged since the last scrape: reuse its articles without parsing
+            return self._not_modified(cached)
+        
+        result = self._html_result(source_key, source, response.content)
+        if result.get("success"):
+            self.conditional.store(source['url'], response, result)
+        return result
+    
+    def _feed_result(self, source_key: str, source: Dict, stream) -> Optional[Dict[str, Any]]:
+        """Parse a feed body into a source result; None if it has no entries"""
+        default_author = COMPILED_SELECTORS.get(source_key, {}).get("author", "Unknown")
+        known = self._known(source_key)
+        with PARSE_SECONDS.time(source=source_key, via="feed"):
+            articles = parse_feed(stream, source['name'], default_author, known=known)
+        # No entries at all means a broken feed; only known ones means nothing new
+        if not articles and not (known and known.hits):
+            return None
+        return self._incremental_result(source_key, {
             "success": True,
             "source": source['url'],
             "source_name": source['name'],
-            "total_articles": len(news_items),
-            "articles": news_items,
+            "via": "feed",
+            "total_articles": len(articles),
+            "articles": articles,
             "scraped_at": datetime.now().isoformat()
-        }
+        }, known)
+    
+    def _html_result(self, source_key: str, source: Dict, content: bytes) -> Dict[str, Any]:
+        """Parse a listing page into a source result"""
+        with PARSE_SECONDS.time(source=source_key, via="html"):
+            soup = make_soup(content, parser=self.parser,
+                             region=source_key if self.restrict_parsing else None)
+        known = self._known(source_key)
+        with EXTRACT_SECONDS.time(source=source_key):
+            result = extract_articles(soup, source_key, source, known=known)
+        if result.get("success"):
+            result["via"] = "html"
+        return self._incremental_result(source_key, result, known)
     
-    def _scrape_mit_news(self, soup: BeautifulSoup, source: Dict) -> Dict[str, Any]:
-        """Scrape MIT News AI"""
-        articles = soup.find_all(['article', 'div'], class_=re.compile(r'.*article.*|.*news.*|.*story.*'))
+    @staticmethod
+    def _not_modified(cached: Dict[str, Any]) -> Dict[str, Any]:
+        result = {**cached, "not_modified": True, "scraped_at": datetime.now().isoformat()}
+        if "new_articles" in cached:
+            result["new_articles"] = []
+        return result
+    
+    async def scrape_source_async(self, source_key: str, session, deadline: Optional[Deadline] = None) -> Dict[str, Any]:
+        """scrape_source on an event loop, fetching with an aiohttp session.
         
-        if not articles:
-            articles = soup.find_all('div', class_=re.compile(r'.*'))
+        Parsing runs in a worker thread so the loop keeps serving other
+        requests while a page is being parsed.
+        """
+        source = self.sources[source_key]
+        breaker = self.breakers[source_key]
+        if not breaker.allow():
+            return self._circuit_open(source_key, source)
+        print(f"\n🔍 Scraping {source['name']}...")
+        deadline = Deadline(self.source_deadline, parent=deadline)
+        start = time.perf_counter()
         
-        news_items = []
+        request_failed = False
+        try:
+            result = None
+            if self.use_feeds and source.get("feed_url"):
+                result = await self._scrape_feed_async(source_key, source, session, deadline)
+                if result is None:
+                    deadline.check(source['name'])
+            if result is None:
+                result = await self.retry.call_async(
+                    lambda: self._scrape_html_async(source_key, source, session, deadline), source['name'], deadline)
         
-        for article in articles[:10]:
-            try:
-                title_element = article.find(['h3', 'h2', 'h1']) or article.find('a', href=True)
-                if not title_element:
-                    continue
-                
-                title = title_element.get_text(strip=True)
-                if len(title) < 10 or title.lower() in ['mit news', 'artificial intelligence', 'topics']:
-                    continue
-                
-                link_element = article.find('a', href=True)
-                link = link_element.get('href') if link_element else None
-                if link and not link.startswith('http'):
-                    link = "https://news.mit.edu" + link
+        except (requests.RequestException, *ASYNC_REQUEST_ERRORS) as e:
+            # requests.RequestException covers DeadlineExceeded from deadline.check()
+            request_failed = True
+            if deadline.expired:
+                result = self.timed_out_result(source_key)
+            else:
+                result = {"error": f"Request failed for {source['name']}: {str(e) or type(e).__name__}"}
+        except asyncio.CancelledError:
+            # Cut off by scrape_all_sources_async's deadline
+            self._finish(source_key, {"timed_out": True}, True, start)
+            raise
+        except Exception as e:
+            result = {"error": f"Scraping failed for {source['name']}: {str(e)}"}
+        if self.enrich:
+            result = await asyncio.to_thread(self._enrich, source_key, result, deadline)
+        return self._finish(source_key, result, request_failed, start)
+    
+    async def _scrape_feed_async(self, source_key: str, source: Dict, session,
+                                 deadline: Optional[Deadline] = None) -> Optional[Dict[str, Any]]:
+        feed_url = source['feed_url']
+        try:
+            headers = {**self.headers, **self.conditional.request_headers(feed_url)}
+            with FETCH_SECONDS.time(source=source_key, via="feed"):
+                async with limited_get(session, feed_url, headers=headers,
+                                       timeout=async_timeout(deadline)) as response:
+                    response.raise_for_status()
+                    
+                    cached = self.conditional.payload(feed_url)
+                    if response.status == 304 and cached:
+                        return self._not_modified(cached)
+                    
+                    body = await response.read()
+            RESPONSE_BYTES.inc(len(body), source=source_key, via="feed")
+            result = await asyncio.to_thread(self._feed_result, source_key, source, io.BytesIO(body))
+        except Exception as e:
+            print(f"⚠️ Feed failed for {source['name']}, using HTML: {str(e) or type(e).__name__}")
+            return None
+        
+        if result is not None:
+            self.conditional.store(feed_url, response, result)
+        return result
+    
+    async def _scrape_html_async(self, source_key: str, source: Dict, session,
+                                 deadline: Optional[Deadline] = None) -> Dict[str, Any]:
+        if source_key not in COMPILED_SELECTORS:
+            return {"error": f"Unknown source: {source_key}"}
+        
+        headers = {**self.headers, **self.conditional.request_headers(source['url'])}
+        with FETCH_SECONDS.time(source=source_key, via="html"):
+            async with limited_get(session, source['url'], headers=headers,
+                                   timeout=async_timeout(deadline)) as response:
+                response.raise_for_status()
                 
-                news_items.append({
-                    "title": title,
-                    "author": "MIT News",
-                    "date": "Unknown",
-                    "excerpt": "",
-                    "link": link,
-                    "source": source['name'],
-                    "scraped_at": datetime.now().isoformat()
-                })
+                cached = self.conditional.payload(source['url'])
+                if response.status == 304 and cached:
+                    return self._not_modified(cached)
                 
-            except Exception as e:
-                continue
+                content = await response.read()
+        RESPONSE_BYTES.inc(len(content), source=source_key, via="html")
         
-        return {
-            "success": True,
-            "source": source['url'],
-            "source_name": source['name'],
-            "total_articles": len(news_items),
-            "articles": news_items,
-            "scraped_at": datetime.now().isoformat()
-        }
+        result = await asyncio.to_thread(self._html_result, source_key, source, content)
+        if result.get("success"):
+            self.conditional.store(source['url'], response, result)
+        return result
     
-    def _scrape_towards_ai(self, soup: BeautifulSoup, source: Dict) -> Dict[str, Any]:
-        """Scrape Towards AI"""
-        articles = soup.find_all(['article', 'div'], class_=re.compile(r'.*article.*|.*post.*|.*card.*|.*content.*'))
+    def iter_results(self, source_keys: Optional[List[str]] = None,
+                     fetch: Optional[Callable[[str], Dict[str, Any]]] = None,
+                     deadline: Optional[Deadline] = None) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Yield (source_key, result) pairs in completion order, fetching in parallel.
         
-        if not articles:
-            articles = soup.find_all('div', class_=re.compile(r'.*'))
+        Stops when the deadline passes; sources still running are not waited for.
+        """
+        source_keys = list(self.sources.keys()) if source_keys is None else source_keys
+        fetch = fetch or self.scrape_source
+        workers = max(1, min(self.max_workers, len(source_keys)))
+        pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="scrape")
+        try:
+            futures = {pool.submit(fetch, source_key): source_key for source_key in source_keys}
+            for future in as_completed(futures, timeout=deadline.remaining() if deadline else None):
+                yield futures[future], future.result()
+        except FuturesTimeout:
+            return
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+    
+    def _fetch_all(self, source_keys: List[str], concurrent: bool, deadline: Deadline,
+                   profiler: Optional[ScrapeProfiler] = None) -> Dict[str, Dict[str, Any]]:
+        """Run scrape_source for each key, in parallel when concurrent is set (never while profiling)"""
+        if profiler is not None or not concurrent or self.max_workers <= 1 or len(source_keys) <= 1:
+            results = {}
+            for source_key in source_keys:
+                if deadline.expired:
+                    continue
+                if profiler is not None:
+                    results[source_key] = profiler.run(source_key, lambda: self.scrape_source(source_key, deadline))
+                else:
+                    results[source_key] = self.scrape_source(source_key, deadline)
+        else:
+            results = dict(self.iter_results(source_keys, lambda key: self.scrape_source(key, deadline), deadline))
         
-        news_items = []
+        # Keep results in source order so the JSON shape matches the sequential path
+        return {source_key: results.get(source_key) or self.timed_out_result(source_key)
+                for source_key in source_keys}
+    
+    def scrape_all_sources(self, concurrent: bool = True, deadline: Optional[float] = None,
+                           profiler: Optional[ScrapeProfiler] = None) -> Dict[str, Any]:
+        """Scrape all sources and combine results.
         
-        for article in articles[:10]:
-            try:
-                title_element = article.find(['h3', 'h2', 'h1']) or article.find('a', href=True)
-                if not title_element:
-                    continue
-                
-                title = title_element.get_text(strip=True)
-                if len(title) < 10 or title.lower() in ['towards ai', 'artificial intelligence', 'latest']:
-                    continue
-                
-                link_element = article.find('a', href=True)
-                link = link_element.get('href') if link_element else None
-                if link and not link.startswith('http'):
-                    link = "https://towardsai.net" + link
-                
-                news_items.append({
-                    "title": title,
-                    "author": "Towards AI",
-                    "date": "Unknown",
-                    "excerpt": "",
-                    "link": link,
-                    "source": source['name'],
-                    "scraped_at": datetime.now().isoformat()
-                })
-                
-            except Exception as e:
-                continue
+        After `deadline` seconds (default total_deadline) the sources that have
+        not finished are reported as timed out and the rest are returned.
+        With a profiler, sources are scraped one at a time, each under
+        cProfile and tracemalloc, and the result carries a "profile" summary.
+        """
+        print("🚀 Starting Universal AI News Scraper...")
+        print("=" * 50)
         
-        return {
-            "success": True,
-            "source": source['url'],
-            "source_name": source['name'],
-            "total_articles": len(news_items),
-            "articles": news_items,
-            "scraped_at": datetime.now().isoformat()
-        }
+        deadline = Deadline(self.total_deadline if deadline is None else deadline)
+        all_results = self._fetch_all(list(self.sources.keys()), concurrent, deadline, profiler)
+        self._report(all_results)
+        combined = self.combine_results(all_results)
+        if profiler is not None:
+            combined["profile"] = profiler.summary()
+        return combined
     
-    def _scrape_marktechpost(self, soup: BeautifulSoup, source: Dict) -> Dict[str, Any]:
-        """Scrape MarkTechPost"""
-        articles = soup.find_all(['article', 'div'], class_=re.compile(r'.*article.*|.*post.*|.*card.*|.*content.*|.*entry.*'))
+    async def scrape_all_sources_async(self, session=None, deadline: Optional[float] = None) -> Dict[str, Any]:
+        """scrape_all_sources on an event loop: every source is fetched concurrently
+        without a thread per request (pass a session to reuse its connections)"""
+        if session is None:
+            async with create_async_session() as session:
+                return await self.scrape_all_sources_async(session, deadline)
         
-        if not articles:
-            articles = soup.find_all('div', class_=re.compile(r'.*'))
+        print("🚀 Starting Universal AI News Scraper (async)...")
+        print("=" * 50)
         
-        news_items = []
+        deadline = Deadline(self.total_deadline if deadline is None else deadline)
+        tasks = {key: asyncio.ensure_future(self.scrape_source_async(key, session, deadline)) for key in self.sources}
+        done, pending = await asyncio.wait(tasks.values(), timeout=deadline.remaining())
+        for task in pending:
+            task.cancel()
+        all_results = {key: task.result() if task in done else self.timed_out_result(key)
+                       for key, task in tasks.items()}
+        self._report(all_results)
+        return self.combine_results(all_results)
+    
+    def crawl_source(self, source_key: str, crawler: Optional[Crawler] = None) -> Dict[str, Any]:
+        """Backfill a source by crawling its paginated listing pages.
         
-        for article in articles[:10]:
-            try:
-                title_element = article.find(['h1', 'h2', 'h3', 'h4']) or article.find('a', href=True)
-                if not title_element:
-                    continue
-                
-                title = title_element.get_text(strip=True)
-                if len(title) < 10 or title.lower() in ['marktechpost', 'artificial intelligence', 'latest']:
-                    continue
-                
-                link_element = article.find('a', href=True)
-                link = link_element.get('href') if link_element else None
-                if link and not link.startswith('http'):
-                    link = "https://www.marktechpost.com" + link
-                
-                news_items.append({
-                    "title": title,
-                    "author": "MarkTechPost",
-                    "date": "Unknown",
-                    "excerpt": "",
-                    "link": link,
-                    "source": source['name'],
-                    "scraped_at": datetime.now().isoformat()
-                })
-                
-            except Exception as e:
-                continue
+        Unlike scrape_source this follows "next" and numbered page links up to
+        the crawler's page and depth limits, keeps every article found (once
+        per link) and reports the crawl's statistics under "crawl".
+        """
+        source = self.sources[source_key]
+        if source_key not in COMPILED_SELECTORS:
+            return {"error": f"Unknown source: {source_key}"}
+        crawler = crawler or Crawler.from_env()
+        print(f"\n🕸️ Crawling {source['name']}...")
+        
+        def handle(url: str, content: bytes, depth: int) -> Tuple[List[Dict[str, Any]], List[str]]:
+            RESPONSE_BYTES.inc(len(content), source=source_key, via="crawl")
+            # The whole page is parsed: pagination links sit outside the post-list region
+            with PARSE_SECONDS.time(source=source_key, via="crawl"):
+                soup = make_soup(content, parser=self.parser)
+            with EXTRACT_SECONDS.time(source=source_key):
+                result = extract_articles(soup, source_key, source, limit=100)
+            return result.get("articles", []), pagination_links(soup, source_key, url)
+        
+        try:
+            crawl = crawler.crawl(source['url'], handle, headers=self.headers)
+        except Exception as e:
+            return {"error": f"Crawling failed for {source['name']}: {str(e)}"}
+        
+        articles, links = [], set()
+        for article in crawl.pop("items"):
+            link = normalize_url(article["link"]) if article.get("link") else None
+            if link is None or link not in links:
+                articles.append(article)
+                links.add(link)
+        if not crawl["pages"]:
+            return {"error": f"Crawl of {source['name']} fetched no pages", "crawl": crawl}
         
-        return {
+        print(f"✅ {source['name']}: {len(articles)} articles from {crawl['pages']} pages "
+              f"({crawl['pages_per_second']} pages/s)")
+        return self._enrich(source_key, {
             "success": True,
             "source": source['url'],
             "source_name": source['name'],
-            "total_articles": len(news_items),
-            "articles": news_items,
+            "via": "crawl",
+            "total_articles": len(articles),
+            "articles": articles,
+            "crawl": crawl,
             "scraped_at": datetime.now().isoformat()
-        }
+        }, Deadline(crawler.deadline))
     
-    def scrape_all_sources(self) -> Dict[str, Any]:
-        """Scrape all sources and combine results"""
-        print("🚀 Starting Universal AI News Scraper...")
+    def crawl_all_sources(self, crawler: Optional[Crawler] = None) -> Dict[str, Any]:
+        """Crawl every source in turn (each crawl fetches its pages in parallel) and combine results"""
+        print("🚀 Starting Universal AI News crawl...")
         print("=" * 50)
         
-        all_results = {}
+        crawler = crawler or Crawler.from_env()
+        all_results = {source_key: self.crawl_source(source_key, crawler) for source_key in self.sources}
+        self._report(all_results)
+        return self.combine_results(all_results)
+    
+    def _report(self, all_results: Dict[str, Dict[str, Any]]):
+        for source_key, result in all_results.items():
+            if result.get("success"):
+                print(f"✅ {result['source_name']}: {result['total_articles']} articles")
+            else:
+                print(f"❌ {self.sources[source_key]['name']}: {result.get('error', 'Unknown error')}")
+    
+    def combine_results(self, all_results: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+        """Combine per-source results into the universal response shape"""
         combined_articles = []
         total_articles = 0
         
-        for source_key in self.sources.keys():
-            result = self.scrape_source(source_key)
-            all_results[source_key] = result
-            
+        for result in all_results.values():
             if result.get("success"):
                 total_articles += result.get("total_articles", 0)
                 combined_articles.extend(result.get("articles", []))
-                print(f"✅ {result['source_name']}: {result['total_articles']} articles")
-            else:
-                print(f"❌ {self.sources[source_key]['name']}: {result.get('error', 'Unknown error')}")
         
         # Sort combined articles by scraped time (newest first)
         combined_articles.sort(key=lambda x: x.get('scraped_at', ''), reverse=True)
         
-        return {
+        # Derived from the sources so an unchanged set of results combines identically
+        scraped_at = max((r["scraped_at"] for r in all_results.values() if r.get("scraped_at")),
+                         default=datetime.now().isoformat())
+        
+        timed_out = [key for key, result in all_results.items() if result.get("timed_out")]
+        
+        combined = {
             "success": True,
+            "partial": bool(timed_out),
+            "timed_out_sources": timed_out,
             "total_sources": len(self.sources),
             "total_articles": total_articles,
             "sources": all_results,
             "combined_articles": combined_articles,
-            "scraped_at": datetime.now().isoformat()
+            "scraped_at": scraped_at
         }
+        if self.incremental:
+            combined["total_new_articles"] = sum(len(result.get("new_articles", []))
+                                                 for result in all_results.values() if result.get("success"))
+        return combined
     
     def save_to_file(self, data: Dict[str, Any], filename: str = "universal_ai_news.json"):
         """Save scraped data to JSON file"""
@@ -302,12 +564,54 @@ class UniversalAIScraper:
             print(f"\n💾 Data saved to {filename}")
         except Exception as e:
             print(f"Error saving file: {e}")
+    
+    def save_to_store(self, data: Dict[str, Any], store: Optional[ArticleStore] = None):
+        """Upsert every source's articles into the persistent article store"""
+        try:
+            store = store or ArticleStore()
+            new = updated = 0
+            for source_key, result in data.get("sources", {}).items():
+                if result.get("success") and not result.get("not_modified"):
+                    # Incremental results only need their new articles stored
+                    counts = store.upsert(source_key, result.get("new_articles", result.get("articles", [])))
+                    new += counts["new"]
+                    updated += counts["updated"]
+            print(f"🗄️ Stored {new} new and {updated} updated articles in {store.path}")
+        except Exception as e:
+            print(f"Error saving to store: {e}")
 
 def main():
-    scraper = UniversalAIScraper()
+    arg_parser = argparse.ArgumentParser(description="Scrape AI news from all sources")
+    arg_parser.add_argument("--profile", nargs="?", const=PROFILE_DIR, metavar="DIR",
+                            help=f"profile each source (CPU and allocations) into DIR (default {PROFILE_DIR})")
+    arg_parser.add_argument("--incremental", action="store_true",
+                            help="extract and store only articles newer than those already in the article store")
+    arg_parser.add_argument("--enrich", action="store_true",
+                            help="read each article's own page for its date, author, excerpt and word count")
+    arg_parser.add_argument("--crawl", action="store_true",
+                            help="backfill by following each source's paginated listing pages")
+    arg_parser.add_argument("--max-pages", type=int, help="pages a crawl may fetch per source")
+    arg_parser.add_argument("--max-depth", type=int, help="pagination links a crawl may follow from the first page")
+    args = arg_parser.parse_args()
+    
+    scraper = UniversalAIScraper(incremental=args.incremental or None, enrich=args.enrich or None)
+    if scraper.incremental:
+        scraper.seed_seen(ArticleStore())
     
-    # Scrape all sources
-    all_news = scraper.scrape_all_sources()
+    # Scrape all sources; a profiled run is slow, so only the per-source deadline applies
+    if args.crawl:
+        crawler = Crawler.from_env()
+        if args.max_pages is not None:
+            crawler.max_pages = args.max_pages
+        if args.max_depth is not None:
+            crawler.max_depth = args.max_depth
+        all_news = scraper.crawl_all_sources(crawler)
+    elif args.profile:
+        profiler = ScrapeProfiler(args.profile)
+        all_news = scraper.scrape_all_sources(deadline=0, profiler=profiler)
+        print(f"\n🔬 Profiles written to {profiler.run_dir}")
+    else:
+        all_news = scraper.scrape_all_sources()
     
     if all_news.get("success"):
         print(f"\n🎉 Successfully scraped {all_news['total_articles']} articles from {all_news['total_sources']} sources!")
@@ -324,6 +628,7 @@ def main():
         
         # Save to file
         scraper.save_to_file(all_news)
+        scraper.save_to_store(all_news)
         
     else:
         print(f"❌ Error: {all_news.get('error', 'Unknown error')}")
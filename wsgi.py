@@ -0,0 +1,16 @@
+#!/usr/bin/env python3
+"""
+WSGI entry point for production servers
+    gunicorn -c gunicorn.conf.py wsgi:application
+Each worker imports this module after forking, so each one joins the
+scheduler leader election; only the winner scrapes.
+"""
+
+import atexit
+
+from app import app, start_background_scraping, stop_background_scraping
+
+application = app
+
+start_background_scraping()
+atexit.register(stop_background_scraping)